@@ -1,6 +1,6 @@
 {
     'name': 'Doc Studio',
-    'version': '1.1',
+    'version': '1.2',
     'category': 'Productivity/Documentation',
     'summary': 'Confluence-like Documentation Studio with Git Sync',
     'description': """
@@ -0,0 +1,17 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Backfill parent_path of the existing page trees, the effective
+    permissions derived from it, and the link graph"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['doc.page']._parent_store_compute()
+    env['doc.page.acl']._refresh()
+    env['doc.page.link']._sync(env['doc.page'].search([('content_md', '!=', False)]))
+    # The visibility rule has been reloaded with its new domain (see
+    # pre-migrate): protect it from later upgrades again
+    cr.execute("""
+        UPDATE ir_model_data
+           SET noupdate = true
+         WHERE module = 'odoo_doc_studio' AND name = 'doc_page_visibility_rule'
+    """)
@@ -0,0 +1,7 @@
+def migrate(cr, version):
+    """Let the (noupdate) page visibility rule be reloaded with its new domain"""
+    cr.execute("""
+        UPDATE ir_model_data
+           SET noupdate = false
+         WHERE module = 'odoo_doc_studio' AND name = 'doc_page_visibility_rule'
+    """)
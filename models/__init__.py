@@ -4,3 +4,11 @@ from . import doc_workspace
 from . import doc_share
 from . import res_config_settings
 from . import doc_git
+from . import doc_sync_manifest
+from . import doc_markdown
+from . import doc_writeback
+from . import doc_writeback_pending
+from . import doc_page_tombstone
+from . import doc_page_acl
+from . import doc_page_link
+from . import doc_watcher
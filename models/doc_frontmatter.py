@@ -0,0 +1,184 @@
+"""Frontmatter of the mirrored Markdown files.
+
+A small YAML subset, enough for what Doc Studio writes and what editors
+(Obsidian, VS Code...) commonly add: `key: value` pairs with plain, 'single'
+or "double" quoted values, flow lists (`tags: [a, b]`) and block lists::
+
+    ---
+    title: "Setup: step 1"
+    tags:
+      - onboarding
+      - it
+    ---
+
+Files are read as streams: the header is parsed line by line up to the
+closing `---`, and the content hash is computed on the same pass.
+"""
+import hashlib
+
+FRONTMATTER_DELIMITER = '---'
+# A header larger than this is not frontmatter (e.g. a lone '---' rule)
+MAX_HEADER_LINES = 500
+
+_NEEDS_QUOTES = ('"', "'", '[', ']', '{', '}', '>', '|', '*', '&', '!', '%', '@', '#', '`', '-', '?', ',')
+_ESCAPES = {'n': '\n', 't': '\t', '"': '"', '\\': '\\'}
+
+
+def new_content_digest():
+    """Digest of file contents, as stored in the sync manifest"""
+    return hashlib.sha1()
+
+
+def _unquote(raw):
+    if raw[0] == "'":
+        return raw[1:-1].replace("''", "'")
+    chars = []
+    inner = iter(raw[1:-1])
+    for char in inner:
+        if char == '\\':
+            escaped = next(inner, '')
+            chars.append(_ESCAPES.get(escaped, '\\' + escaped))
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def _split_flow_list(raw):
+    items, current, quote = [], [], None
+    for char in raw:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == ',':
+            items.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    items.append(''.join(current))
+    return [item.strip() for item in items if item.strip()]
+
+
+def parse_value(raw):
+    """Plain, quoted or [flow, list] scalar -> str or list of str"""
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in '"\'':
+        return _unquote(raw)
+    if raw.startswith('[') and raw.endswith(']'):
+        return [parse_value(item) for item in _split_flow_list(raw[1:-1])]
+    return raw
+
+
+def parse_header_lines(lines):
+    """Metadata dict from the lines between the two '---' delimiters"""
+    metadata = {}
+    list_key = None
+    block_keys = set()
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if list_key and (stripped.startswith('- ') or stripped == '-'):
+            metadata[list_key].append(parse_value(stripped[1:]))
+            continue
+        list_key = None
+        if ':' not in stripped:
+            continue
+        key, value = stripped.split(':', 1)
+        key = key.strip()
+        if value.strip():
+            metadata[key] = parse_value(value)
+        else:
+            # Block list (or empty value) follows on the next lines
+            metadata[key] = []
+            list_key = key
+            block_keys.add(key)
+    for key in block_keys:
+        if metadata[key] == []:
+            # No '- ' item followed: an empty scalar (`workspace:`)
+            metadata[key] = ''
+    return metadata
+
+
+def read_frontmatter(stream, digest=None):
+    """Parse the frontmatter at the current position of a binary stream.
+
+    Reads only up to the closing delimiter and leaves the stream positioned
+    right after it (at the start of the body). Without frontmatter, the
+    stream is left where it was.
+
+    :param digest: hashlib object updated with every byte consumed
+    :return: (metadata, consumed bytes of the header)
+    """
+    start = stream.tell()
+    first_line = stream.readline()
+    if first_line.rstrip(b'\r\n').decode('utf-8', errors='replace') != FRONTMATTER_DELIMITER:
+        stream.seek(start)
+        return {}, b''
+    consumed = [first_line]
+    lines = []
+    for dummy in range(MAX_HEADER_LINES):
+        line = stream.readline()
+        if not line:
+            break
+        consumed.append(line)
+        decoded = line.decode('utf-8', errors='replace').rstrip('\r\n')
+        if decoded.rstrip() == FRONTMATTER_DELIMITER:
+            header = b''.join(consumed)
+            if digest is not None:
+                digest.update(header)
+            return parse_header_lines(lines), header
+        lines.append(decoded)
+    # Unterminated: not frontmatter
+    stream.seek(start)
+    return {}, b''
+
+
+def read_markdown_file(full_path):
+    """Read a mirrored Markdown file in one pass.
+
+    :return: (metadata, body, content hash). A body following frontmatter is
+             stripped, like the content_md it was written from.
+    """
+    digest = new_content_digest()
+    with open(full_path, 'rb') as f:
+        metadata, header = read_frontmatter(f, digest)
+        body = f.read()
+    digest.update(body)
+    body = body.decode('utf-8', errors='replace')
+    return metadata, body.strip() if header else body, digest.hexdigest()
+
+
+def split_frontmatter(content):
+    """Same as read_markdown_file, for content already in memory"""
+    lines = content.split('\n')
+    if not lines or lines[0].rstrip('\r') != FRONTMATTER_DELIMITER:
+        return {}, content
+    for index, line in enumerate(lines[1:MAX_HEADER_LINES + 1], start=1):
+        if line.rstrip() == FRONTMATTER_DELIMITER:
+            return parse_header_lines(lines[1:index]), '\n'.join(lines[index + 1:]).strip()
+    return {}, content
+
+
+def format_value(value):
+    """Serialize a scalar so that parse_value gives it back unchanged"""
+    value = str(value)
+    if (not value or value != value.strip() or value.startswith(_NEEDS_QUOTES)
+            or ': ' in value or ' #' in value or value.endswith(':') or '\n' in value or '\\' in value):
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\t', '\\t')
+        return f'"{escaped}"'
+    return value
+
+
+def format_frontmatter(items):
+    """'---' block for (key, value) pairs; list values become block lists"""
+    lines = [FRONTMATTER_DELIMITER]
+    for key, value in items:
+        if isinstance(value, (list, tuple)):
+            lines.append(f"{key}:")
+            lines.extend(f"  - {format_value(item)}" for item in value)
+        else:
+            lines.append(f"{key}: {format_value(value)}")
+    lines.append(FRONTMATTER_DELIMITER)
+    return '\n'.join(lines) + '\n'
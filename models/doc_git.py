@@ -76,15 +76,68 @@ class DocGitManager(models.AbstractModel):
             
             origin = repo.remotes.origin
             # Pull with rebase enabled (git pull --rebase)
+            pre_pull = self._get_head_commit(repo)
             origin.pull(rebase=True)
-            
-            # After pull, we should re-sync Odoo DB
-            self.env['doc.page'].sync_all_from_disk()
-            return "Successfully pulled updates and synced Odoo."
+            post_pull = self._get_head_commit(repo)
+
+            if pre_pull and pre_pull == post_pull:
+                return "Already up to date."
+
+            # After pull, re-sync only what the pull touched
+            if pre_pull and post_pull:
+                changed, deleted, renamed = self._diff_name_status(repo, pre_pull, post_pull)
+                count = self.env['doc.page']._apply_disk_changes(changed, deleted, renamed)
+            else:
+                # Nothing to diff against (first pull into an empty repository)
+                count = self.env['doc.page'].sync_all_from_disk()
+            return f"Successfully pulled updates and synced Odoo ({count} pages changed)."
         except Exception as e:
             _logger.error(f"Git Pull Failed: {e}")
             raise UserError(f"Git Pull Failed: {e}")
 
+    @api.model
+    def _get_head_commit(self, repo):
+        try:
+            return repo.head.commit.hexsha
+        except ValueError:
+            # Unborn branch: the repository has no commits yet
+            return None
+
+    @api.model
+    def _diff_name_status(self, repo, old_commit, new_commit):
+        """
+        Parse `git diff --name-status -M` between two commits.
+        Returns (changed_paths, deleted_paths, renamed_paths) where renamed_paths
+        is a list of (old_path, new_path) pairs.
+        """
+        # -z: NUL separated, paths are never quoted
+        output = repo.git.diff('--name-status', '-M', '-z', old_commit, new_commit)
+        tokens = output.split('\0')
+
+        changed, deleted, renamed = [], [], []
+        i = 0
+        while i < len(tokens):
+            status = tokens[i]
+            if not status:
+                i += 1
+                continue
+            if status[0] in ('R', 'C'):
+                old_path, new_path = tokens[i + 1], tokens[i + 2]
+                i += 3
+                if status[0] == 'R':
+                    renamed.append((old_path, new_path))
+                else:
+                    changed.append(new_path)
+            else:
+                path = tokens[i + 1]
+                i += 2
+                if status[0] == 'D':
+                    deleted.append(path)
+                else:
+                    # A(dded), M(odified), T(ype change)
+                    changed.append(path)
+        return changed, deleted, renamed
+
     @api.model
     def _cron_auto_sync(self):
         """Cron job to sync git (Push local changes, Pull remote changes)"""
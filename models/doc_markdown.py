@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from odoo import models, api
+from odoo.exceptions import AccessError
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:
+    MarkdownIt = None
+
+MARKDOWN_EXTENSIONS = ('fenced_code', 'tables', 'nl2br')
+
+MARKDOWN_BACKENDS = [
+    ('python_markdown', 'Python-Markdown'),
+    ('markdown_it', 'markdown-it-py (CommonMark, faster)'),
+]
+DEFAULT_BACKEND = 'python_markdown'
+
+# Per-worker memory budget of the render cache
+RENDER_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+class RenderCache:
+    """Thread-safe LRU cache bounded by the memory used by its entries.
+
+    Keys are content hashes, so entries never need explicit invalidation:
+    anything that changes the output must be part of the key, and stale
+    entries simply age out.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cost(self, key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        cost = self._cost(key, value)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old_value = self._entries.pop(key, None)
+            if old_value is not None:
+                self.size -= self._cost(key, old_value)
+            self._entries[key] = value
+            self.size += cost
+            while self.size > self.max_bytes:
+                old_key, old_value = self._entries.popitem(last=False)
+                self.size -= self._cost(old_key, old_value)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_render_cache = RenderCache(RENDER_CACHE_MAX_BYTES)
+
+# Converters are not thread-safe: each thread keeps its own, reused across calls
+_converters = threading.local()
+
+
+def _backend_available(backend):
+    if backend == 'markdown_it':
+        return MarkdownIt is not None
+    return markdown is not None
+
+
+def _get_converter(backend):
+    pool = getattr(_converters, 'pool', None)
+    if pool is None:
+        pool = _converters.pool = {}
+    converter = pool.get(backend)
+    if converter is None:
+        if backend == 'markdown_it':
+            # Same feature set as MARKDOWN_EXTENSIONS: fences (built in), tables, nl2br
+            converter = MarkdownIt('commonmark', {'breaks': True, 'html': True}).enable('table')
+        else:
+            converter = markdown.Markdown(extensions=list(MARKDOWN_EXTENSIONS))
+        pool[backend] = converter
+    return converter
+
+
+def _render_with(backend, text):
+    converter = _get_converter(backend)
+    if backend == 'markdown_it':
+        return converter.render(text)
+    # Python-Markdown keeps per-document state (footnotes, references...)
+    return converter.reset().convert(text)
+
+
+def _normalize_html(html):
+    """Canonical form used to compare backends: void tags, whitespace between tags"""
+    html = re.sub(r'\s*/>', '>', html)
+    html = re.sub(r'>\s+<', '><', html)
+    return html.strip()
+
+
+class DocMarkdownRenderer(models.AbstractModel):
+    _name = 'doc.markdown.renderer'
+    _description = 'Markdown Rendering Service'
+
+    @api.model
+    def _get_backend(self):
+        backend = self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_doc_studio.markdown_backend', DEFAULT_BACKEND)
+        if backend not in dict(MARKDOWN_BACKENDS) or not _backend_available(backend):
+            return DEFAULT_BACKEND
+        return backend
+
+    @api.model
+    def _markdown_to_html(self, text):
+        """Plain Markdown -> HTML conversion with the configured backend.
+
+        Uses this thread's pooled converter instead of building a new Markdown
+        object and extension registry on every call.
+        """
+        return _render_with(self._get_backend(), text)
+
+    @api.model
+    def _cache_key(self, kind, content, key_parts):
+        digest = hashlib.sha1()
+        for part in (kind, MARKDOWN_EXTENSIONS, *key_parts):
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+
+    @api.model
+    def _cached(self, kind, content, compute, *key_parts):
+        """Return compute() for `content`, memoized in the per-worker render cache.
+
+        :param kind: conversion name, e.g. 'md2html'
+        :param key_parts: everything else the output depends on (link index
+                          version, base directory of relative links, ...)
+        """
+        key = self._cache_key(kind, content, (self._get_backend(), *key_parts))
+        value = _render_cache.get(key)
+        if value is None:
+            value = compute()
+            _render_cache.put(key, value)
+        return value
+
+    @api.model
+    def get_cache_stats(self):
+        """Hit/miss counters of this worker's render cache, for monitoring"""
+        return _render_cache.stats()
+
+    @api.model
+    def benchmark_backends(self, limit=None, repeat=3):
+        """
+        Render the Markdown of existing pages with every installed backend.
+
+        Reports throughput for each backend (plus the historical one-shot
+        markdown.markdown() call as a baseline) and output parity against
+        Python-Markdown, compared on normalized HTML. Link resolution and the
+        render cache are bypassed: only the converters are measured.
+        """
+        if not self.env.user.has_group('odoo_doc_studio.group_doc_studio_manager'):
+            raise AccessError("Only Doc Studio administrators can run the renderer benchmark.")
+
+        pages = self.env['doc.page'].sudo().search_read(
+            [('content_md', '!=', False)], ['content_md'], limit=limit)
+        corpus = [(page['id'], page['content_md']) for page in pages]
+        corpus_bytes = sum(len(text.encode('utf-8')) for dummy, text in corpus)
+
+        def run(render):
+            outputs = {}
+            start = time.perf_counter()
+            for dummy in range(repeat):
+                for page_id, text in corpus:
+                    outputs[page_id] = render(text)
+            elapsed = time.perf_counter() - start
+            return outputs, {
+                'seconds': round(elapsed, 4),
+                'pages_per_second': round(len(corpus) * repeat / elapsed, 1) if elapsed else None,
+                'mb_per_second': round(corpus_bytes * repeat / elapsed / 1e6, 2) if elapsed else None,
+            }
+
+        results = {'pages': len(corpus), 'bytes': corpus_bytes, 'repeat': repeat, 'backends': {}}
+        if markdown is None:
+            return results
+
+        reference, stats = run(lambda text: markdown.markdown(text, extensions=list(MARKDOWN_EXTENSIONS)))
+        results['backends']['python_markdown_oneshot'] = stats
+        for backend, dummy in MARKDOWN_BACKENDS:
+            if not _backend_available(backend):
+                results['backends'][backend] = {'available': False}
+                continue
+            outputs, stats = run(lambda text: _render_with(backend, text))
+            mismatches = [
+                page_id for page_id, html in outputs.items()
+                if _normalize_html(html) != _normalize_html(reference[page_id])
+            ]
+            stats.update({
+                'available': True,
+                'mismatches': len(mismatches),
+                'mismatch_page_ids': mismatches[:20],
+            })
+            results['backends'][backend] = stats
+
+        _logger.info(f"Markdown backend benchmark: {results}")
+        return results
@@ -1,12 +1,70 @@
 import logging
 import os
 import re
-from markupsafe import Markup
-from odoo import models, fields, api, _
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from markupsafe import Markup, escape
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import UserError
+from odoo.fields import Command
+from odoo.tools import SQL
+from odoo.tools.sql import escape_psql, create_index, index_exists
+
+from .doc_frontmatter import read_markdown_file, split_frontmatter, format_frontmatter
+from .doc_writeback import write_mirror_file, lock_disk_import
+from .doc_writeback_pending import is_pending_path
 
 _logger = logging.getLogger(__name__)
 
+# Full-text search configuration per language of the UI (es, es_AR -> spanish).
+# Each one gets its own GIN index, see DocPage.init()
+SEARCH_CONFIGS = {'en': 'english', 'es': 'spanish'}
+DEFAULT_SEARCH_CONFIG = 'english'
+# ts_headline markers, replaced by <mark> once the snippet is escaped
+_HIGHLIGHT_START = '[[hl]]'
+_HIGHLIGHT_STOP = '[[/hl]]'
+# Translatable names (tags) are written to, and looked up from, frontmatter in
+# this language, whatever the language of the user saving or syncing
+FRONTMATTER_LANG = 'en_US'
+# Threads reading files during disk imports (odoo_doc_studio.sync_io_workers)
+DEFAULT_SYNC_IO_WORKERS = 4
+MAX_SYNC_IO_WORKERS = 32
+
+
+class StructureCache:
+    """Thread-safe per-database cache of values derived from the page structure.
+
+    Only the latest structure version is kept: storing a value for another
+    version drops everything cached for the previous one, so the memory used
+    is bounded by one version's entries instead of growing with every
+    structural change.
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, dbname, version, key=None):
+        with self._lock:
+            if self._versions.get(dbname) != version:
+                return None
+            return self._entries[dbname].get(key)
+
+    def put(self, dbname, version, value, key=None):
+        with self._lock:
+            if self._versions.get(dbname) != version:
+                self._versions[dbname] = version
+                self._entries[dbname] = {}
+            self._entries[dbname][key] = value
+
+
+# Sidebar trees, per (uid, su, parent_id, depth)
+_nav_tree_cache = StructureCache()
+# The file_path -> id index (see DocPage._get_path_index)
+_path_index_cache = StructureCache()
+
 try:
     import git
     from markdownify import markdownify as md
@@ -22,9 +80,12 @@ class DocPage(models.Model):
     _description = 'Documentation Page'
     _order = 'sequence, id'
     _rec_name = 'name'
+    _parent_store = True
 
-    name = fields.Char(string='Title', required=True)
+    name = fields.Char(string='Title', required=True, index='trigram')
     parent_id = fields.Many2one('doc.page', string='Parent Page', ondelete='cascade')
+    # Ancestor ids ("1/5/9/"): breadcrumbs and subtrees in one indexed query
+    parent_path = fields.Char(index=True)
     child_ids = fields.One2many('doc.page', 'parent_id', string='Sub-pages')
     sequence = fields.Integer(string='Sequence', default=10)
     
@@ -54,6 +115,8 @@ class DocPage(models.Model):
        help="Private: Only owner and shared users.\nInternal: All employees.\nPublic: Everyone.")
     
     share_ids = fields.One2many('doc.share', 'page_id', string='Shares')
+    # Shares of the page and its ancestors, resolved per user (see doc.page.acl)
+    acl_ids = fields.One2many('doc.page.acl', 'page_id', string='Effective Permissions')
     
     current_user_permission = fields.Selection([
         ('none', 'None'),
@@ -67,33 +130,48 @@ class DocPage(models.Model):
     body_html = fields.Html(string='Content (HTML)', compute='_compute_body_html', inverse='_inverse_body_html', store=True, sanitize=False)
     
     # Document Linking
-    linked_page_ids = fields.Many2many('doc.page', 'doc_page_link_rel', 'source_id', 'target_id',
-                                        string='Linked Documents', compute='_compute_linked_pages', store=True)
+    link_ids = fields.One2many('doc.page.link', 'source_id', string='Outgoing Links',
+                               groups='odoo_doc_studio.group_doc_studio_manager')
+    linked_page_ids = fields.Many2many('doc.page', string='Linked Documents', compute='_compute_linked_pages')
     
     # Git Integration
-    file_path = fields.Char(string='File Path', compute='_compute_file_path', store=True, recursive=True)
+    # Materialized: maintained in bulk by _update_subtree_paths (see create/write)
+    file_path = fields.Char(string='File Path', index='trigram', readonly=True, copy=False)
 
+    # Sidebar: version of the last structural change of the page (see get_nav_tree_state)
+    structure_version = fields.Integer(string='Structure Version', index=True, readonly=True, copy=False)
+
+    def init(self):
+        # Versions are handed out outside of transactions (see _stamp_structure_version)
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS doc_page_structure_seq")
+        # Full-text search: the index expressions must match _get_search_vector()
+        for config in set(SEARCH_CONFIGS.values()):
+            index_name = f'doc_page_search_{config}_idx'
+            if not index_exists(self.env.cr, index_name):
+                create_index(self.env.cr, index_name, self._table,
+                             [f'({self._get_search_vector(config).code})'], method='gin')
+
+    @api.depends_context('uid')
     @api.depends('visibility', 'share_ids.user_id', 'share_ids.permission')
     def _compute_current_user_permission(self):
+        user = self.env.user
+        # Shares on the records or their ancestors, one query for all records
+        share_permissions = self.env['doc.page.acl'].sudo()._get_permissions(user.id, self._origin.ids)
         for record in self:
-            if record.create_uid == self.env.user:
+            if record.create_uid == user:
                 record.current_user_permission = 'owner'
                 continue
-            
-            # Check explicit share - most specific first
-            share = record.share_ids.filtered(lambda s: s.user_id == self.env.user)
-            if share:
-                # If multiple shares, take the most permissive (write > read)
-                if any(s.permission == 'write' for s in share):
-                    record.current_user_permission = 'write'
-                else:
-                    record.current_user_permission = 'read'
+
+            # Check (inherited) share - the most permissive one (write > read)
+            permission = share_permissions.get(record._origin.id)
+            if permission:
+                record.current_user_permission = permission
                 continue
-                
+
             # Check internal visibility
             if record.visibility == 'internal':
                 # Default for internal pages is Editor/Writer in this wiki-like system
-                record.current_user_permission = 'write' 
+                record.current_user_permission = 'write'
             elif record.visibility == 'public':
                 record.current_user_permission = 'read'
             else:
@@ -105,12 +183,7 @@ class DocPage(models.Model):
         for record in self:
             if record.content_md and markdown:
                 try:
-                    # Preprocess doc:// links to make them clickable
-                    processed_md = record._resolve_doc_links_to_html(record.content_md)
-                    # Convert Markdown to HTML
-                    html_content = markdown.markdown(processed_md, extensions=['fenced_code', 'tables', 'nl2br'])
-                    # CLEANUP: Ensure no full HTML doc boilerplates remain
-                    html_content = record._clean_html_fragment(html_content)
+                    html_content = record._render_markdown(record.content_md)
                     # Ensure string type
                     record.body_html = Markup(html_content) if html_content else ""
                 except Exception as e:
@@ -124,16 +197,7 @@ class DocPage(models.Model):
         for record in self:
             if record.body_html and md:
                 try:
-                    # CLEANUP: Strip full HTML doc boilerplates if present
-                    clean_html = record._clean_html_fragment(record.body_html)
-                    # Convert HTML to Markdown
-                    markdown_content = md(clean_html, heading_style="ATX")
-                    # Ensure string type (markdownify can return objects)
-                    if not isinstance(markdown_content, str):
-                        markdown_content = str(markdown_content) if markdown_content else ""
-                    # Convert clickable links back to doc:// scheme
-                    markdown_content = record._convert_html_links_to_doc_scheme(markdown_content)
-                    record.content_md = markdown_content
+                    record.content_md = record._html_to_markdown(record.body_html)
                 except Exception as e:
                     _logger.error(f"Error converting HTML to Markdown for page {record.id}: {e}")
                     # Keep existing content_md on error
@@ -164,6 +228,42 @@ class DocPage(models.Model):
                 html_str = re.sub(r'</?(html|head|meta|title|link)[^>]*>', '', html_str, flags=re.IGNORECASE)
         
         return html_str.strip()
+
+    def _render_markdown(self, md_content):
+        """Markdown -> clean HTML fragment with doc links resolved.
+
+        Memoized in the worker's render cache, keyed on the content, the link
+        index version and the directory relative links are resolved against.
+        """
+        Renderer = self.env['doc.markdown.renderer']
+
+        def render():
+            # Preprocess doc:// links to make them clickable
+            processed_md = self._resolve_doc_links_to_html(md_content)
+            # Convert Markdown to HTML
+            html_content = Renderer._markdown_to_html(processed_md)
+            # CLEANUP: Ensure no full HTML doc boilerplates remain
+            return self._clean_html_fragment(html_content)
+
+        return Renderer._cached(
+            'md2html', md_content, render,
+            self._get_path_index_version(), os.path.dirname(self.file_path or ''),
+        )
+
+    def _html_to_markdown(self, html_content):
+        """HTML (from the Wysiwyg) -> Markdown with doc:// links, memoized like _render_markdown"""
+        def convert():
+            # CLEANUP: Strip full HTML doc boilerplates if present
+            clean_html = self._clean_html_fragment(html_content)
+            # Convert HTML to Markdown
+            markdown_content = md(clean_html, heading_style="ATX")
+            # Ensure string type (markdownify can return objects)
+            if not isinstance(markdown_content, str):
+                markdown_content = str(markdown_content) if markdown_content else ""
+            # Convert clickable links back to doc:// scheme
+            return self._convert_html_links_to_doc_scheme(markdown_content)
+
+        return self.env['doc.markdown.renderer']._cached('html2md', str(html_content), convert)
     
     @api.model
     def action_convert_md_to_html(self, md_content):
@@ -173,9 +273,7 @@ class DocPage(models.Model):
         try:
             # We create a dummy record to use link resolution logic
             dummy = self.new({'content_md': md_content})
-            processed_md = dummy._resolve_doc_links_to_html(md_content)
-            html_content = markdown.markdown(processed_md, extensions=['fenced_code', 'tables', 'nl2br'])
-            return dummy._clean_html_fragment(html_content)
+            return dummy._render_markdown(md_content)
         except Exception as e:
             _logger.error(f"Sync MD to HTML error: {e}")
             return "<p>Error converting content</p>"
@@ -186,15 +284,7 @@ class DocPage(models.Model):
         if not html_content:
             return ""
         try:
-            # Clean first
-            dummy = self.new()
-            clean_html = dummy._clean_html_fragment(html_content)
-            # Convert
-            markdown_content = md(clean_html, heading_style="ATX")
-            if not isinstance(markdown_content, str):
-                markdown_content = str(markdown_content) if markdown_content else ""
-            # Fix links
-            return dummy._convert_html_links_to_doc_scheme(markdown_content)
+            return self.new()._html_to_markdown(html_content)
         except Exception as e:
             _logger.error(f"Sync HTML to MD error: {e}")
             return "Error converting content"
@@ -215,26 +305,25 @@ class DocPage(models.Model):
         pattern_id = r'\[([^\]]+)\]\(doc://([0-9]+)\)'
         markdown_text = re.sub(pattern_id, replace_doc_link, markdown_text)
 
-        # 2. File Path Links
+        # 2. File Path Links (dictionary lookups in the path index, no query per link)
+        path_index = self.env['doc.page']._get_path_index()
+        current_dir = os.path.dirname(self.file_path) if self.file_path else None
+
         def replace_file_link(match):
             text = match.group(1)
             target_path = match.group(2)
             
-            # Resolve relative path using self.file_path context
-            target_page = False
-            
             # A. Try exact match (e.g. from root)
-            target_page = self.env['doc.page'].search([('file_path', '=', target_path)], limit=1)
+            target_id = path_index.get(target_path)
             
-            # B. Try relative match
-            if not target_page and self.file_path:
-                current_dir = os.path.dirname(self.file_path)
+            # B. Try relative match, using self.file_path context
+            if not target_id and current_dir is not None:
                 # target_path might be "Sedes Oficiales.md"
                 abs_target = os.path.normpath(os.path.join(current_dir, target_path))
-                target_page = self.env['doc.page'].search([('file_path', '=', abs_target)], limit=1)
+                target_id = path_index.get(abs_target)
             
-            if target_page:
-                return f"[{text}]({get_odoo_url(target_page.id)})"
+            if target_id:
+                return f"[{text}]({get_odoo_url(target_id)})"
             
             return match.group(0) # Keep original if not found
 
@@ -254,56 +343,236 @@ class DocPage(models.Model):
         pattern = r'\[([^\]]+)\]\(/web#[^&]*&active_id=([0-9]+)\)'
         return re.sub(pattern, replace_web_link, markdown_text)
     
-    @api.depends('content_md')
+    @api.depends('link_ids.target_id')
+    @api.depends_context('uid')
     def _compute_linked_pages(self):
-        """Extract doc:// references and populate linked_page_ids"""
-        for record in self:
-            if record.content_md:
-                # Find all doc://page_id references
-                pattern = r'doc://([0-9]+)'
-                page_ids = [int(match) for match in re.findall(pattern, record.content_md)]
-                # Remove duplicates and self-references
-                page_ids = list(set(page_ids))
-                if record.id in page_ids:
-                    page_ids.remove(record.id)
-                record.linked_page_ids = [(6, 0, page_ids)]
-            else:
-                record.linked_page_ids = [(5, 0, 0)]
+        """Pages this one links to (doc:// and .md path links) that the user can see.
 
-    @api.depends('name', 'parent_id.file_path')
-    def _compute_file_path(self):
-        if self.env.context.get('skip_file_path_compute'):
-            return
-            
+        The link graph is not readable by users (its rows would reveal private
+        pages): it is read as superuser and the targets filtered here."""
         for record in self:
-            slug = self._slugify(record.name)
-            if record.parent_id:
-                # If parent exists, nested folder structure
-                # Parent path is a directory, current record is a directory + index.md? 
-                # Or Confluence style: each page is a file, unless it has children?
-                # Docusaurus style: folders for categories, files for pages.
-                # Let's simple: always a folder matching the hierarchy, and the content in index.md inside it? 
-                # Or just file.md if leaf, folder/index.md if parent?
-                # Let's go with: /Parent/Child.md
-                parent_path = record.parent_id.file_path or ""
-                parent_dir = os.path.dirname(parent_path) if parent_path.endswith('.md') else parent_path
-                # Wait, parent_id.file_path logic needs to be consistent.
-                # Let's try: /slug.md for root. 
-                # If parent is /slug.md, and we add child, parent becomes /slug/index.md?
-                # Simpler: All pages are folders with index.md? No, that's messy.
-                record.file_path = self._get_path_recursive(record)
-            else:
-                record.file_path = f"{slug}.md"
+            targets = record.sudo().link_ids.target_id - record.sudo()
+            record.linked_page_ids = self.browse(targets.ids)._filtered_access('read')
+
+    def get_backlinks(self, limit=None):
+        """Pages linking to this one ("what links here"), in one indexed query"""
+        self.ensure_one()
+        self.env['doc.page.link'].flush_model()
+        self.env.cr.execute(SQL("""
+            SELECT source.id, source.name
+              FROM doc_page source
+             WHERE source.id IN (SELECT source_id FROM doc_page_link WHERE target_id = %(target_id)s)
+               AND source.id IN %(visible)s
+             ORDER BY source.name, source.id
+             LIMIT %(limit)s
+        """, target_id=self.id, visible=self._search([]).subselect(), limit=limit))
+        return [{'id': page_id, 'name': name} for page_id, name in self.env.cr.fetchall()]
 
-    def _get_path_recursive(self, record):
-        slug = self._slugify(record.name)
-        if record.parent_id:
-            parent_path = self._get_path_recursive(record.parent_id)
+    @api.model
+    def get_broken_links(self, limit=None):
+        """Links (of visible pages) whose target page does not exist:
+        [{'source_id', 'source_name', 'target_ref'}], in one query"""
+        self.env['doc.page.link'].flush_model()
+        self.env.cr.execute(SQL("""
+            SELECT source.id, source.name, link.target_ref
+              FROM doc_page_link link
+              JOIN doc_page source ON source.id = link.source_id
+             WHERE link.target_id IS NULL
+               AND source.id IN %(visible)s
+             ORDER BY source.name, source.id, link.target_ref
+             LIMIT %(limit)s
+        """, visible=self._search([]).subselect(), limit=limit))
+        return [
+            {'source_id': source_id, 'source_name': source_name, 'target_ref': target_ref}
+            for source_id, source_name, target_ref in self.env.cr.fetchall()
+        ]
+
+    def _get_expected_file_path(self):
+        """Path derived from the title, below the directory of the parent's file:
+        'Root.md' for a root page, 'Parent/Child.md' for a child"""
+        self.ensure_one()
+        slug = self._slugify(self.name)
+        parent_path = self.parent_id.file_path
+        if parent_path:
             # Strip .md to get directory
-            parent_dir = parent_path.replace('.md', '')
-            return f"{parent_dir}/{slug}.md"
+            return f"{parent_path[:-3]}/{slug}.md"
         return f"{slug}.md"
 
+    def _update_subtree_paths(self):
+        """Re-derive file_path of these pages and move their whole subtrees along.
+
+        For each moved page, one statement (parent_path prefix match over the
+        subtree) rewrites every path of the subtree by prefix replacement, the manifest
+        follows in bulk, and the mirror is updated after commit with a single
+        rename of the page's file and of its directory.
+        """
+        self.flush_model(['name', 'parent_id', 'parent_path', 'file_path'])
+        repo_path = self._get_git_repo_path()
+        Queue = self.env['doc.writeback.queue']
+        # Paths given up or taken over, for the path links pointing at them
+        changed_paths = []
+        # Parents before children (by depth: new pages have no path yet), so a
+        # child sees its parent's new path
+        for record in self.sorted(lambda r: (r.parent_path or '').count('/')):
+            old_path = record.file_path
+            new_path = record._get_expected_file_path()
+            if old_path == new_path:
+                continue
+
+            if not old_path:
+                self.env.cr.execute(
+                    "UPDATE doc_page SET file_path = %s WHERE id = %s",
+                    [new_path, record.id],
+                )
+                self.invalidate_model(['file_path'])
+                record._mark_structure_changed()
+                changed_paths.append(new_path)
+                record.child_ids._update_subtree_paths()
+                continue
+
+            old_dir = old_path[:-3] + '/'
+            new_dir = new_path[:-3] + '/'
+            self.env.cr.execute("""
+                UPDATE doc_page
+                   SET file_path = CASE WHEN id = %(root_id)s THEN %(new_path)s
+                                        ELSE %(new_dir)s || substr(file_path, length(%(old_dir)s) + 1) END
+                 WHERE id = %(root_id)s
+                    OR (parent_path LIKE %(subtree_like)s AND file_path LIKE %(old_dir_like)s)
+             RETURNING id, file_path
+            """, {
+                'root_id': record.id,
+                'subtree_like': escape_psql(record.parent_path) + '%',
+                'new_path': new_path,
+                'old_dir': old_dir,
+                'new_dir': new_dir,
+                'old_dir_like': escape_psql(old_dir) + '%',
+            })
+            moved_ids = []
+            for moved_id, moved_path in self.env.cr.fetchall():
+                moved_ids.append(moved_id)
+                changed_paths.append(moved_path)
+                changed_paths.append(old_path if moved_path == new_path else old_dir + moved_path[len(new_dir):])
+            self.invalidate_model(['file_path'])
+            self._get_structure_changes()['page_ids'].update(moved_ids)
+            self.env['doc.sync.manifest'].sudo()._move_paths(old_path, new_path)
+            # Relative links of the moved pages now point elsewhere
+            Link = self.env['doc.page.link'].sudo()
+            Link._sync(Link.search([('link_type', '=', 'path'), ('source_id', 'child_of', record.id)]).source_id)
+
+            Queue._enqueue_move(os.path.join(repo_path, old_path), os.path.join(repo_path, new_path))
+            Queue._enqueue_move(os.path.join(repo_path, old_dir[:-1]), os.path.join(repo_path, new_dir[:-1]))
+
+        self._invalidate_path_index(changed_paths)
+
+    def _build_path_index(self):
+        """(file_path -> id index, version) built with one query.
+
+        The version changes whenever any path or id changes, so it can key caches
+        of anything derived from the index (e.g. rendered links)."""
+        self.env.cr.execute("SELECT file_path, id FROM doc_page WHERE file_path IS NOT NULL")
+        index = tools.frozendict(self.env.cr.fetchall())
+        return index, hash(frozenset(index.items()))
+
+    def _get_path_index_shared(self, version):
+        """Path index of a committed structure version, shared by the worker.
+        Every path change bumps the structure version, and only the index of
+        the latest version is kept. Do not mutate the result."""
+        entry = _path_index_cache.get(self.env.cr.dbname, version)
+        if entry is None:
+            entry = self._build_path_index()
+            _path_index_cache.put(self.env.cr.dbname, version, entry)
+        return entry
+
+    def _get_path_index_entry(self):
+        data = self.env.cr.precommit.data
+        entry = data.get('doc.page.path_index')
+        if entry is None:
+            if data.get('doc.page.paths_dirty'):
+                self.flush_model(['file_path'])
+                entry = self._build_path_index()
+            else:
+                entry = self._get_path_index_shared(self._get_structure_version())
+            data['doc.page.path_index'] = entry
+        return entry
+
+    @api.model
+    def _get_path_index(self):
+        """file_path -> page id for every page (regardless of access rights).
+
+        Cached for the transaction. Transactions that moved, created or deleted
+        pages build their own index instead of the shared one, which must only
+        ever hold committed paths.
+        """
+        return self._get_path_index_entry()[0]
+
+    @api.model
+    def _get_path_index_version(self):
+        return self._get_path_index_entry()[1]
+
+    @api.model
+    def _invalidate_path_index(self, paths=()):
+        """:param paths: file paths that pages took or gave up (their links get re-resolved)"""
+        data = self.env.cr.precommit.data
+        data.pop('doc.page.path_index', None)
+        data['doc.page.paths_dirty'] = True
+        self.env['doc.page.link'].sudo()._schedule_path_resolution(paths)
+
+    @api.model
+    def _get_structure_version(self):
+        """Current (committed) version of the sidebar structure (names, hierarchy, order, visibility)"""
+        self.env.cr.execute("""
+            SELECT GREATEST((SELECT max(structure_version) FROM doc_page),
+                            (SELECT max(version) FROM doc_page_tombstone), 0)
+        """)
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_structure_changes(self):
+        """Pages changed and deleted by this transaction, stamped with a new
+        version right before it commits (see _stamp_structure_version)"""
+        data = self.env.cr.precommit.data
+        changes = data.get('doc.page.structure_changes')
+        if changes is None:
+            changes = data['doc.page.structure_changes'] = {'page_ids': set(), 'deleted_ids': set()}
+            env = self.env
+
+            @self.env.cr.precommit.add
+            def stamp():
+                # Queued behind the other precommit hooks, so the lock is held
+                # for the stamping and the commit only
+                env.cr.precommit.add(lambda: env['doc.page']._stamp_structure_version(changes))
+        return changes
+
+    @api.model
+    def _stamp_structure_version(self, changes):
+        """Precommit: stamp the structural changes of the transaction with a new version.
+
+        Versions are taken under an advisory lock held until the commit, so they
+        get committed in increasing order: a client that saw version N saw every
+        change up to N. The lock is only taken here, at the very end of the
+        transaction, so long transactions (imports) don't block the others.
+        """
+        self.env.cr.precommit.data.pop('doc.page.structure_changes', None)
+        self.env.cr.execute("SELECT pg_advisory_xact_lock(hashtext('doc_page_structure'))")
+        self.env.cr.execute("SELECT nextval('doc_page_structure_seq')")
+        version = self.env.cr.fetchone()[0]
+        if changes['page_ids']:
+            self.env.cr.execute(
+                "UPDATE doc_page SET structure_version = %s WHERE id = ANY(%s)",
+                [version, sorted(changes['page_ids'])],
+            )
+            self.invalidate_model(['structure_version'])
+        if changes['deleted_ids']:
+            Tombstone = self.env['doc.page.tombstone'].sudo()
+            Tombstone._record_deletions(sorted(changes['deleted_ids']), version)
+            Tombstone.flush_model()
+
+    def _mark_structure_changed(self):
+        """Mark these pages and their parents (whose children changed) for the new version"""
+        pages = self | self.parent_id
+        if pages:
+            self._get_structure_changes()['page_ids'].update(pages.ids)
+
     def _slugify(self, text):
         if not text:
             return ""
@@ -314,35 +583,64 @@ class DocPage(models.Model):
 
     def _ensure_unique_name(self, name):
         """Check if name exists and append (1), (2)... if it does"""
-        original_name = name
-        count = 1
-        # Use self.env to avoid singleton issues if self is model
-        domain = [('name', '=', name)]
-        if self:
-            domain.append(('id', 'not in', self.ids))
-            
-        while self.env['doc.page'].search(domain, limit=1):
-            name = f"{original_name} ({count})"
-            count += 1
-            domain[0] = ('name', '=', name)
-        return name
+        return self._ensure_unique_names([name], exclude_ids=self.ids)[0]
+
+    @api.model
+    def _ensure_unique_names(self, names, exclude_ids=()):
+        """Make a whole batch of names unique with one query.
+
+        All the names possibly colliding (the names themselves and their
+        'name (n)' variants) are fetched at once, through the name index; names
+        colliding with existing pages, or with each other, then get the first
+        free (1), (2)... suffix in memory, in list order.
+
+        :param exclude_ids: pages whose current names don't count (renamed pages)
+        """
+        if not names:
+            return []
+        bases = list(set(names))
+        self.flush_model(['name'])
+        self.env.cr.execute("""
+            SELECT name FROM doc_page
+             WHERE (name = ANY(%s) OR name LIKE ANY(%s))
+               AND NOT (id = ANY(%s))
+        """, [bases, [escape_psql(name) + ' (%)' for name in bases], list(exclude_ids)])
+        taken = {row[0] for row in self.env.cr.fetchall()}
+
+        unique_names = []
+        for name in names:
+            unique_name = name
+            count = 1
+            while unique_name in taken:
+                unique_name = f"{name} ({count})"
+                count += 1
+            taken.add(unique_name)
+            unique_names.append(unique_name)
+        return unique_names
 
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if 'name' in vals:
-                vals['name'] = self._ensure_unique_name(vals['name'])
+        # Pages imported from disk come with names already made unique in batch,
+        # and must not be written back over the file they were read from.
+        from_disk = self.env.context.get('doc_from_disk')
+        if not from_disk:
+            named = [vals for vals in vals_list if vals.get('name')]
+            for vals, unique_name in zip(named, self._ensure_unique_names([vals['name'] for vals in named])):
+                vals['name'] = unique_name
         records = super().create(vals_list)
-        for record in records:
-            record._sync_to_git()
+        # Pages from disk keep the path they were read from
+        if not self.env.context.get('skip_file_path_compute'):
+            records.filtered(lambda r: not r.file_path)._update_subtree_paths()
+        self._invalidate_path_index(records.mapped('file_path'))
+        records._mark_structure_changed()
+        self.env['doc.page.link'].sudo()._sync(records.filtered('content_md'))
+        # Sub-pages inherit the shares of their ancestors
+        if records.filtered('parent_id'):
+            self.env['doc.page.acl'].sudo()._refresh(records.filtered('parent_id'))
+        if not from_disk:
+            records._queue_sync_to_git()
         return records
 
-    def unlink(self):
-        # Delete file from git sync before removing record
-        for record in self:
-            record._delete_from_git()
-        return super().unlink()
-
     def action_acquire_lock(self):
         """Try to acquire lock for current user. Returns success/failure info."""
         self.ensure_one()
@@ -376,6 +674,11 @@ class DocPage(models.Model):
             return True
         return False
 
+    # Fields the editor sends on every save, checked for no-op writes
+    _NOOP_CHECKED_FIELDS = {'content_md', 'body_html', 'name', 'parent_id'}
+    # Fields shown in, or deciding who sees, the sidebar (file_path also keys the path index)
+    _STRUCTURE_FIELDS = {'name', 'parent_id', 'sequence', 'visibility', 'file_path'}
+
     def write(self, vals):
         # Enforce Lock Check before writing content
         if 'body_html' in vals or 'content_md' in vals or 'name' in vals:
@@ -383,40 +686,113 @@ class DocPage(models.Model):
                 if record.locked_by and record.locked_by != self.env.user:
                     raise UserError(_("This document is currently locked by %s. Please try again later.") % record.locked_by.name)
 
-        # Handle name uniqueness if changing
-        if 'name' in vals:
+        # The editor re-sends title, parent and content on every save: drop what
+        # didn't change, so identical saves skip tracking, rendering and disk writes.
+        if self._NOOP_CHECKED_FIELDS & set(vals):
+            unchanged_groups = defaultdict(list)
             for record in self:
-                # Ensure each record gets a unique version of the requested name
-                unique_name = record._ensure_unique_name(vals['name'])
+                unchanged_groups[record._get_unchanged_fields(vals)].append(record.id)
+            if list(unchanged_groups) != [frozenset()]:
+                for unchanged, record_ids in unchanged_groups.items():
+                    remaining = {k: v for k, v in vals.items() if k not in unchanged}
+                    if remaining:
+                        self.browse(record_ids).write(remaining)
+                return True
+
+        # Renames and moves change file_path (and the paths of the whole subtree)
+        if {'name', 'parent_id', 'file_path'} & set(vals):
+            self._invalidate_path_index(self.mapped('file_path') + [vals.get('file_path')])
+        # The importer keeps the paths read from disk
+        moves_paths = bool({'name', 'parent_id'} & set(vals)) \
+            and not self.env.context.get('skip_file_path_compute')
+        from_disk = self.env.context.get('doc_from_disk')
+        structure_changed = bool(self._STRUCTURE_FIELDS & set(vals))
+        if 'parent_id' in vals:
+            # The former parents lose children
+            self._mark_structure_changed()
+
+        # Handle name uniqueness if changing
+        if vals.get('name'):
+            # Each record gets its own unique version of the requested name
+            unique_names = self._ensure_unique_names([vals['name']] * len(self), exclude_ids=self.ids)
+            for record, unique_name in zip(self, unique_names):
                 # Manual update for name to avoid recursion and allow unique names per record
                 super(DocPage, record).write({'name': unique_name})
             # Remove name from vals to avoid re-writing the non-unique name in super() below
             vals = {k: v for k, v in vals.items() if k != 'name'}
 
-        if not vals:
-            return True
+        if vals:
+            content_changed = 'body_html' in vals or 'content_md' in vals
 
-        # Track editing user
-        if 'body_html' in vals or 'content_md' in vals:
-            vals['last_editor_id'] = self.env.uid
-        
-        res = super().write(vals)
-        
-        # Increment edit count
-        if 'body_html' in vals or 'content_md' in vals:
-            for record in self:
-                super(DocPage, record).write({'edit_count': record.edit_count + 1})
-        
-        # Sync to git
-        for record in self:
-            record._sync_to_git()
-            
-        return res
+            # Track editing user
+            if content_changed:
+                vals['last_editor_id'] = self.env.uid
+
+            super().write(vals)
+
+            if 'parent_id' in vals:
+                # The moved subtrees now inherit the shares of other ancestors
+                self.env['doc.page.acl'].sudo()._refresh(self)
+
+            # Increment edit count (one UPDATE for the whole recordset)
+            if content_changed:
+                self.flush_recordset(['edit_count'])
+                self.env.cr.execute(
+                    "UPDATE doc_page SET edit_count = COALESCE(edit_count, 0) + 1 WHERE id IN %s",
+                    [tuple(self.ids)],
+                )
+                self.invalidate_recordset(['edit_count'])
+                self.env['doc.page.link'].sudo()._sync(self)
+
+        if moves_paths:
+            self._update_subtree_paths()
+        if structure_changed:
+            self._mark_structure_changed()
+
+        # Sync to git on commit (unless the values were just read from disk)
+        if not from_disk:
+            self._queue_sync_to_git()
+
+        return True
+
+    def _get_unchanged_fields(self, vals):
+        """Fields of vals (among _NOOP_CHECKED_FIELDS) whose value equals what's stored"""
+        self.ensure_one()
+        unchanged = set()
+        if 'name' in vals and vals['name'] == self.name:
+            unchanged.add('name')
+        if 'parent_id' in vals and (vals['parent_id'] or False) == self.parent_id.id:
+            unchanged.add('parent_id')
+        if 'content_md' in vals and (vals['content_md'] or '') == (self.content_md or ''):
+            unchanged.add('content_md')
+        if 'body_html' in vals:
+            new_html = str(vals['body_html'] or '')
+            if new_html == str(self.body_html or ''):
+                unchanged.add('body_html')
+            elif md:
+                # Same document, different HTML serialization: compare the Markdown
+                # it converts to (the conversion is memoized, the inverse reuses it)
+                try:
+                    if self._html_to_markdown(new_html) == (self.content_md or ''):
+                        unchanged.add('body_html')
+                except Exception:
+                    pass
+        return frozenset(unchanged)
 
     def unlink(self):
-        # Delete file from git sync before removing record
-        for record in self:
-            record._delete_from_git()
+        # Sub-pages go too (ondelete cascade), found with one parent_path query
+        deleted = self.sudo().search([('id', 'child_of', self.ids)])
+        # Delete their files and directories on commit (unless already gone from disk)
+        if not self.env.context.get('doc_from_disk'):
+            repo_path = self._get_git_repo_path()
+            paths = [page.file_path for page in deleted if page.file_path]
+            # Deepest first, so directories are empty by the time they are removed
+            paths = sorted(paths + [path[:-3] for path in paths], key=lambda path: -path.count('/'))
+            self.env['doc.writeback.queue']._enqueue_deletes([os.path.join(repo_path, path) for path in paths])
+        # Links to the deleted pages: the path may still be held by another page
+        self._invalidate_path_index(deleted.mapped('file_path'))
+        (self.parent_id - deleted)._mark_structure_changed()
+        self._get_structure_changes()['deleted_ids'].update(deleted.ids)
         return super().unlink()
 
     def _get_git_repo_path(self):
@@ -432,68 +808,124 @@ class DocPage(models.Model):
             record._sync_to_git()
         return True
 
+    def _queue_sync_to_git(self):
+        """Mark pages dirty: each file is rewritten once, after the transaction commits"""
+        self.env['doc.writeback.queue']._enqueue_pages(self)
+
+    def _render_file_content(self):
+        """content_md with its metadata as frontmatter, as mirrored on disk"""
+        self.ensure_one()
+        # Values are quoted when needed, so any page name survives the round trip
+        items = [
+            ('title', self.name),
+            ('author', self.create_uid.name),
+            ('created_at', self.create_date),
+        ]
+        if self.last_editor_id:
+            items.append(('last_editor', self.last_editor_id.name))
+        items += [
+            ('last_edited_at', self.write_date),
+            # Restored on import, see _prepare_frontmatter_vals
+            ('workspace', self.workspace_id.name or ''),
+            ('tags', self.tag_ids.with_context(lang=FRONTMATTER_LANG).mapped('name')),
+            ('visibility', self.visibility),
+            ('sequence', self.sequence),
+            ('icon', self.icon or ''),
+        ]
+        return format_frontmatter(items) + "\n" + (self.content_md or "")
+
     def _sync_to_git(self):
-        """Write content_md and metadata as frontmatter to the file system"""
+        """Write content_md and metadata as frontmatter to the file system, right now"""
         repo_path = self._get_git_repo_path()
-        if not repo_path:
+        if not repo_path or not self.file_path:
             return
 
-        if not os.path.exists(repo_path):
-            try:
-                os.makedirs(repo_path, exist_ok=True)
-                _logger.info(f"Created git repo path: {repo_path}")
-            except OSError as e:
-                _logger.error(f"Could not create git repo path {repo_path}: {e}")
-                return
-
         full_path = os.path.join(repo_path, self.file_path)
-        directory = os.path.dirname(full_path)
-        
-        try:
-            if not os.path.exists(directory):
-                os.makedirs(directory, exist_ok=True)
-                try:
-                    os.chmod(directory, 0o777)
-                except OSError: pass
-            
-            with open(full_path, 'w', encoding='utf-8') as f:
-                # Write enhanced frontmatter
-                f.write("---\n")
-                f.write(f"title: {self.name}\n")
-                f.write(f"author: {self.create_uid.name}\n")
-                f.write(f"created_at: {self.create_date}\n")
-                if self.last_editor_id:
-                    f.write(f"last_editor: {self.last_editor_id.name}\n")
-                f.write(f"last_edited_at: {self.write_date}\n")
-                f.write("---\n\n")
-                f.write(self.content_md or "")
-            
-            try:
-                os.chmod(full_path, 0o666)
-            except OSError:
-                pass
-                
-        except OSError as e:
-            _logger.error(f"Failed to write file {full_path}: {e}")
+        data = self._render_file_content()
+        if write_mirror_file(full_path, data, self.env['doc.writeback.queue']._get_fsync_policy()):
+            # Keep the sync manifest in step so the next disk scan skips our own write
+            self.env['doc.sync.manifest'].sudo()._record_file(self.file_path, full_path, data, self.id)
 
     def _parse_frontmatter(self, content):
         """Helper to extract metadata and content from markdown with frontmatter"""
-        metadata = {}
-        cleaned_content = content
-        if content.startswith('---'):
-            try:
-                second_dash = content.find('\n---', 3)
-                if second_dash != -1:
-                    header = content[3:second_dash].strip()
-                    cleaned_content = content[second_dash+4:].strip()
-                    # Parse simple yaml-like pairs
-                    for line in header.split('\n'):
-                        if ':' in line:
-                            key, val = line.split(':', 1)
-                            metadata[key.strip()] = val.strip()
-            except Exception:
-                pass
-        return metadata, cleaned_content
+        return split_frontmatter(content)
+
+    @api.model
+    def _get_ids_by_name(self, model_name, names):
+        """{name: id} of the records of model_name named names, in one query.
+        Missing ones are created with a single batch create. Translated names
+        are matched (and created) in FRONTMATTER_LANG."""
+        names = set(names)
+        if not names:
+            return {}
+        Model = self.env[model_name].with_context(active_test=False, lang=FRONTMATTER_LANG)
+        name_to_id = {record.name: record.id for record in Model.search_fetch([('name', 'in', list(names))], ['name'])}
+        missing = sorted(names - set(name_to_id))
+        if missing:
+            for record in Model.create([{'name': name} for name in missing]):
+                name_to_id[record.name] = record.id
+        return name_to_id
+
+    @api.model
+    def _prepare_frontmatter_vals(self, metadata_list):
+        """Page values stored in the frontmatter of imported files, one dict per metadata.
+
+        Only keys present in the file are restored: files written by hand keep
+        the values of the page. Tags and workspaces are resolved by name for the
+        whole batch at once; invalid visibilities and sequences are ignored.
+        """
+        def as_list(value):
+            value = value if isinstance(value, list) else [value] if value else []
+            return [item for item in value if isinstance(item, str)]
+
+        def as_str(value):
+            # Hand-written files may hold lists where a scalar is expected
+            return value if isinstance(value, str) else None
+
+        tag_ids = self._get_ids_by_name('doc.tag', {
+            name for metadata in metadata_list for name in as_list(metadata.get('tags'))
+        })
+        workspace_ids = self._get_ids_by_name('doc.workspace', {
+            as_str(metadata.get('workspace')) for metadata in metadata_list
+        } - {None, ''})
+        visibilities = {value for value, dummy in self._fields['visibility'].selection}
+
+        vals_list = []
+        for metadata in metadata_list:
+            vals = {}
+            if 'tags' in metadata:
+                vals['tag_ids'] = [Command.set([tag_ids[name] for name in as_list(metadata['tags']) if name in tag_ids])]
+            workspace = as_str(metadata.get('workspace'))
+            if workspace is not None:
+                vals['workspace_id'] = workspace_ids.get(workspace) or False
+            visibility = as_str(metadata.get('visibility'))
+            if visibility in visibilities:
+                vals['visibility'] = visibility
+            if 'sequence' in metadata:
+                try:
+                    vals['sequence'] = int(metadata['sequence'])
+                except (TypeError, ValueError):
+                    pass
+            icon = as_str(metadata.get('icon'))
+            if icon is not None:
+                vals['icon'] = icon or False
+            vals_list.append(vals)
+        return vals_list
+
+    def _get_changed_frontmatter_vals(self, vals):
+        """The part of vals (from _prepare_frontmatter_vals) that differs from the page"""
+        self.ensure_one()
+        changed = {}
+        for field_name, value in vals.items():
+            if field_name == 'tag_ids':
+                if set(value[0][2]) != set(self.tag_ids.ids):
+                    changed[field_name] = value
+            elif field_name == 'workspace_id':
+                if value != self.workspace_id.id:
+                    changed[field_name] = value
+            elif value != (self[field_name] or False):
+                changed[field_name] = value
+        return changed
 
     def action_sync_from_disk(self):
         """Read content from the file system and update the record"""
@@ -504,23 +936,25 @@ class DocPage(models.Model):
         full_path = os.path.join(repo_path, self.file_path)
         if not os.path.exists(full_path):
              return False
+        if is_pending_path(self.file_path, self.env['doc.writeback.pending'].sudo()._get_paths()):
+            # The file still holds the previous version of the page
+            return False
              
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                raw_content = f.read()
-                
-            metadata, content = self._parse_frontmatter(raw_content)
+            # Single streaming pass: frontmatter, body and content hash
+            metadata, content, content_hash = read_markdown_file(full_path)
+            self.env['doc.sync.manifest'].sudo()._record_file(
+                self.file_path, full_path, page_id=self.id, content_hash=content_hash)
 
-            vals = {}
+            # Organization fields round-trip through the frontmatter; authorship
+            # and dates stay the ones recorded in Odoo.
+            vals = self._get_changed_frontmatter_vals(self._prepare_frontmatter_vals([metadata])[0])
             if content != self.content_md:
                 vals['content_md'] = content
-            
-            # Note: We don't necessarily want to pwn local Odoo metadata (create_date) 
-            # with disk metadata every sync, but we could if we wanted to enforce it.
-            # For now, let's keep it simple and just update content.
-            
+
             if vals:
-                self.write(vals)
+                # Content comes from the file: don't write it back
+                self.with_context(doc_from_disk=True).write(vals)
                 return True
             return False
             
@@ -528,189 +962,653 @@ class DocPage(models.Model):
             _logger.error(f"Failed to read file {full_path}: {e}")
             return False
 
+    def action_sync_from_disk_if_stale(self):
+        """Cheap check run before displaying a page: the file is only read when
+        its (mtime, size) differ from the ones recorded in the sync manifest"""
+        self.ensure_one()
+        repo_path = self._get_git_repo_path()
+        if not repo_path or not self.file_path:
+            return False
+        try:
+            stat = os.stat(os.path.join(repo_path, self.file_path))
+        except OSError:
+            return False
+        entry = self.env['doc.sync.manifest'].sudo()._get_entries([self.file_path]).get(self.file_path)
+        if entry and (entry['mtime'], entry['size']) == (stat.st_mtime, stat.st_size):
+            return False
+        return self.action_sync_from_disk()
+
     @api.model
-    def sync_all_from_disk(self):
+    def action_request_disk_sync(self):
+        """Ask for a background disk -> DB sync as soon as possible.
+
+        Requests are coalesced: the scheduled action runs once for all the
+        triggers due, outside of any user request."""
+        cron = self.sudo().env.ref('odoo_doc_studio.ir_cron_doc_disk_sync', raise_if_not_found=False)
+        if cron and cron.active:
+            cron._trigger()
+        return True
+
+    @api.model
+    def _lock_disk_import(self):
+        """Serialize imports (scheduled sync, disk watcher, git pull) until the
+        end of the transaction, so two of them never create the same pages.
+        The write-back of files takes the same lock (see doc_writeback)."""
+        lock_disk_import(self.env.cr)
+
+    @api.model
+    def _cron_sync_from_disk(self):
+        """Scheduled action: incremental sync of the whole mirror (stat only for unchanged files)"""
+        count = self.sync_all_from_disk()
+        if count:
+            _logger.info(f"Background disk sync: {count} pages changed.")
+
+    def _is_syncable_path(self, rel_path):
+        """Markdown files outside hidden directories (.git, .obsidian, ...)"""
+        if not rel_path or not rel_path.endswith('.md'):
+            return False
+        return not any(part.startswith('.') for part in rel_path.split('/')[:-1])
+
+    def _scan_disk_tree(self, repo_path):
+        """Stat (never read) every Markdown file below repo_path.
+
+        Hidden directories (.git, .obsidian, ...) are skipped. The tree is only
+        listed here; the files are stat'ed concurrently (see _stat_disk_paths).
+        Returns {rel_path: (full_path, mtime, size)}.
         """
-        Full bidirectional sync (Two-Pass):
-        1. Scan file system and create/update ALL records (ignoring parents initially).
-        2. Resolve parent relationships ensuring all potential parents exist.
+        rel_paths = []
+        for root, dirs, files in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            rel_root = os.path.relpath(root, repo_path)
+            rel_paths.extend(
+                os.path.normpath(os.path.join(rel_root, filename)) for filename in files if filename.endswith('.md')
+            )
+        return self._stat_disk_paths(repo_path, rel_paths)
+
+    def _stat_disk_paths(self, repo_path, rel_paths):
+        """{rel_path: (full_path, mtime, size)} of rel_paths, stat'ed in the I/O
+        thread pool (missing files are left out)"""
+        def stat_file(rel_path):
+            full_path = os.path.join(repo_path, rel_path)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                return None
+            return full_path, stat.st_mtime, stat.st_size
+
+        rel_paths = list(rel_paths)
+        return {
+            rel_path: fingerprint
+            for rel_path, fingerprint in zip(rel_paths, self._map_disk_io(stat_file, rel_paths))
+            if fingerprint
+        }
+
+    @api.model
+    def _get_sync_io_workers(self):
+        try:
+            workers = int(self.env['ir.config_parameter'].sudo().get_param(
+                'odoo_doc_studio.sync_io_workers', DEFAULT_SYNC_IO_WORKERS))
+        except ValueError:
+            workers = DEFAULT_SYNC_IO_WORKERS
+        return max(1, min(workers, MAX_SYNC_IO_WORKERS))
+
+    @api.model
+    def _map_disk_io(self, func, items):
+        """list(map(func, items)), spread over a bounded pool of threads.
+
+        On network mounts the latency of each file access dominates, so the
+        accesses are overlapped. func only deals with files and plain data: it
+        must not touch the environment, whose cursor belongs to this thread.
         """
-        # CRITICAL: Prevent Odoo from re-computing file_path (slugifying) when we want to respect disk path
-        self = self.with_context(skip_file_path_compute=True)
-        
-        repo_path = self._get_git_repo_path()
-        if not repo_path or not os.path.exists(repo_path):
-            return 0
+        workers = min(self._get_sync_io_workers(), len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='doc_sync_io') as executor:
+            return list(executor.map(func, items))
+
+    def _get_path_to_id(self):
+        """Mutable copy of the path index, for the importer to update as it creates pages"""
+        return dict(self._get_path_index())
+
+    def _import_disk_files(self, disk_files, path_to_id):
+        """Pass 1: create/update records for files whose fingerprint changed.
+
+        Only files whose (mtime, size) differ from the manifest are read, and only
+        those whose content hash changed are imported (ignoring parents). Files
+        are read concurrently (see _map_disk_io), records written in one batch.
+
+        :param disk_files: {rel_path: (full_path, mtime, size)}
+        :param path_to_id: {file_path: page id}, updated in place with created pages
+        :return: (created_count, updated_count)
+        """
+        Manifest = self.env['doc.sync.manifest'].sudo()
+        manifest = Manifest._get_entries(list(disk_files))
+
+        def read_file(rel_path):
+            # Frontmatter parsed while streaming, hash computed on the same pass
+            try:
+                return read_markdown_file(disk_files[rel_path][0])
+            except OSError as e:
+                _logger.error(f"Error reading {rel_path}: {e}")
+                return None
+
+        to_read = []
+        for rel_path, (full_path, mtime, size) in disk_files.items():
+            entry = manifest.get(rel_path)
+            if entry and (entry['mtime'], entry['size']) == (mtime, size) and rel_path in path_to_id:
+                continue
+            to_read.append(rel_path)
+        # I/O phase in the thread pool; the ORM work below stays in this thread
+        read_results = self._map_disk_io(read_file, to_read)
 
+        fingerprints = []
+        to_import = []
+        for rel_path, result in zip(to_read, read_results):
+            if result is None:
+                continue
+            metadata, content, content_hash = result
+            dummy, mtime, size = disk_files[rel_path]
+            entry = manifest.get(rel_path)
+            page_id = path_to_id.get(rel_path)
+            fingerprints.append({
+                'file_path': rel_path,
+                'mtime': mtime,
+                'size': size,
+                'content_hash': content_hash,
+                'page_id': page_id,
+            })
+            if page_id and entry and entry['content_hash'] == content_hash:
+                # Touched (or copied) but byte-identical: nothing to import
+                continue
+            to_import.append((rel_path, page_id, metadata, content))
+
+        # Records read from disk are never written back to it (doc_from_disk)
+        importer = self.with_context(doc_from_disk=True)
+        # Tags and workspaces of all the files: one lookup (and one create) per model
+        frontmatter_vals = importer._prepare_frontmatter_vals([metadata for dummy, dummy, metadata, dummy in to_import])
+        existing = {
+            page.id: page
+            for page in importer.browse([page_id for dummy, page_id, dummy, dummy in to_import if page_id])
+        }
         updated_count = 0
-        created_count = 0
-        
-        # Pass 1: Create/Update all records
-        # Map: rel_path -> doc.page (for pass 2)
-        start_time = fields.Datetime.now()
-        existing_paths = set(self.search([]).mapped('file_path'))
-        
-        # We need to collect all files first to handle them
-        all_files = []
-        for root, dirs, files in os.walk(repo_path):
-            if '.git' in root: continue
-            for filename in files:
-                if not filename.endswith('.md'): continue
-                full_path = os.path.join(root, filename)
-                rel_path = os.path.relpath(full_path, repo_path)
-                all_files.append((full_path, rel_path, filename))
-
-        for full_path, rel_path, filename in all_files:
-            # Check if exists
-            page = self.search([('file_path', '=', rel_path)], limit=1)
-            
-            if page:
-                # Update content
-                if page.action_sync_from_disk():
+        # Pages with only metadata changes are written together, one write per distinct change
+        metadata_writes = {}
+        new_paths = []
+        vals_list = []
+        for (rel_path, page_id, metadata, content), page_vals in zip(to_import, frontmatter_vals):
+            if page_id:
+                page = existing[page_id]
+                vals = page._get_changed_frontmatter_vals(page_vals)
+                if content != page.content_md:
+                    page.write(dict(vals, content_md=content))
                     updated_count += 1
-            else:
-                # Create (no parent yet)
-                title = filename[:-3]
-                content = ""
-                try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if content.startswith('---'):
-                            try:
-                                end_fm = content.find('\n---', 3)
-                                if end_fm != -1:
-                                    fm_lines = content[3:end_fm].split('\n')
-                                    for line in fm_lines:
-                                        if line.strip().startswith('title:'):
-                                            title = line.split(':', 1)[1].strip()
-                                            break
-                            except: pass
-                except Exception as e:
-                    _logger.error(f"Error reading {rel_path}: {e}")
-                    continue
+                elif vals:
+                    metadata_writes.setdefault(repr(sorted(vals.items())), (vals, []))[1].append(page_id)
+                continue
 
-                try:
-                    self.create({
-                        'name': title,
-                        'content_md': content,
-                        'file_path': rel_path, # Crucial: force path to match disk
-                        'parent_id': False, # Resolve in Pass 2
-                    })
-                    created_count += 1
-                except Exception as e:
-                    _logger.error(f"Failed to create {rel_path}: {e}")
+            new_paths.append(rel_path)
+            title = metadata.get('title')
+            vals_list.append({
+                **page_vals,
+                'name': (title if isinstance(title, str) else '') or os.path.basename(rel_path)[:-3],
+                'content_md': content,
+                'file_path': rel_path, # Crucial: force path to match disk
+                'parent_id': False, # Resolve in Pass 2
+            })
 
-        # Pass 2: Link Parents
-        # We iterate again to find parents based on directory structure
-        # Logic: If I am 'Section/Page.md', my parent is the page at 'Section.md'
-        # Or if I am 'Section/Sub/Page_2.md', parent is 'Section/Sub.md'
-        
-        # Reload mapping (path -> id)
-        # Note: file_path is computed. If we created records, they have computed paths.
-        # Hopefully they match the disk paths.
-        pages = self.search([])
-        path_to_id = {p.file_path: p.id for p in pages if p.file_path}
-        
+        for vals, page_ids in metadata_writes.values():
+            importer.browse(page_ids).write(vals)
+            updated_count += len(page_ids)
+
+        # One batch for all new pages: unique names in one query, a single INSERT,
+        # body_html rendered in one recompute pass at flush, links synced in one diff.
+        created_count = 0
+        if vals_list:
+            names = importer._ensure_unique_names([vals['name'] for vals in vals_list])
+            for vals, name in zip(vals_list, names):
+                vals['name'] = name
+            pages = importer.create(vals_list)
+            created_count = len(pages)
+            for rel_path, page in zip(new_paths, pages):
+                path_to_id[rel_path] = page.id
+
+        for entry in fingerprints:
+            entry['page_id'] = entry['page_id'] or path_to_id.get(entry['file_path'])
+        Manifest._upsert_entries(fingerprints)
+
+        return created_count, updated_count
+
+    def _link_parents_from_paths(self, pages, path_to_id):
+        """Pass 2: enforce the disk structure on parent_id.
+
+        'A/B.md' -> parent is 'A.md', 'A/B/C.md' -> parent is 'A/B.md', 'Root.md' -> no parent
+
+        Children of the same parent are moved with a single write, without
+        recomputing file_path (the disk path is the truth) nor writing files back.
+        """
+        moves = defaultdict(list)
         for p in pages:
-            # Skip if manually set (maybe?) No, sync implies adhering to disk structure.
-            # But let's only update if missing or if strictly enforcing.
-            # For now, let's strict enforce disk structure.
-            
             if not p.file_path: continue
-            
-            # Expected parent path
-            # 'A/B.md' -> Parent is 'A.md'
-            # 'A/B/C.md' -> Parent is 'A/B.md'
-            # 'Root.md' -> No parent
-            
+
             current_dir = os.path.dirname(p.file_path) # 'A' or 'A/B' or ''
             if not current_dir:
-                if p.parent_id:
-                   # Moves to root? Maybe user moved it on disk.
-                   p.parent_id = False
-                continue
-                
-            parent_path_candidate = current_dir + '.md'
-            if parent_path_candidate in path_to_id:
-                parent_id = path_to_id[parent_path_candidate]
-                if p.parent_id.id != parent_id:
-                    p.parent_id = parent_id
-                    
+                # Moves to root? Maybe user moved it on disk.
+                parent_id = False
+            else:
+                parent_id = path_to_id.get(current_dir + '.md')
+                if not parent_id:
+                    continue
+            if p.parent_id.id != parent_id:
+                moves[parent_id].append(p.id)
+
+        writer = self.with_context(skip_file_path_compute=True, doc_from_disk=True)
+        for parent_id, page_ids in moves.items():
+            writer.browse(page_ids).write({'parent_id': parent_id})
+
+    def _prune_missing_pages(self, pages):
+        """Pass 3: delete records whose files are gone from disk.
+
+        `pages` must already be known to be missing (from the scanned path set),
+        so the file system is not checked again.
+        """
+        pages = pages.exists()
+        if pages:
+            _logger.info(f"Pruning {len(pages)} orphaned records: {pages.mapped('file_path')}")
+            # The files are already gone: don't queue their deletion
+            pages.with_context(doc_from_disk=True).unlink()
+        return len(pages)
+
+    @api.model
+    def sync_all_from_disk(self):
+        """
+        Incremental disk -> DB sync driven by the sync manifest (Three-Pass):
+        1. Stat the tree and diff it against the manifest. Only files whose
+           (mtime, size) changed are read, and only those whose content hash
+           changed are created/updated (ignoring parents initially).
+        2. Resolve parent relationships ensuring all potential parents exist.
+        3. Prune records whose files are gone from disk.
+        """
+        # CRITICAL: Prevent Odoo from re-computing file_path (slugifying) when we want to respect disk path
+        # The disk is the source of truth for every page, whoever triggers the sync.
+        self = self.sudo().with_context(skip_file_path_compute=True)
+
+        repo_path = self._get_git_repo_path()
+        if not repo_path or not os.path.exists(repo_path):
+            return 0
+        self._lock_disk_import()
+        # Files committed in Odoo but not written yet: the disk is stale there
+        pending = self.env['doc.writeback.pending'].sudo()._get_paths()
+
+        disk_files = {
+            path: fingerprint for path, fingerprint in self._scan_disk_tree(repo_path).items()
+            if not is_pending_path(path, pending)
+        }
+        path_to_id = self._get_path_to_id()
+        created_count, updated_count = self._import_disk_files(disk_files, path_to_id)
+
+        pages_to_delete = self.browse([
+            page_id for path, page_id in path_to_id.items()
+            if path not in disk_files and not is_pending_path(path, pending)
+        ])
+        Manifest = self.env['doc.sync.manifest'].sudo()
+        Manifest._remove_paths(
+            path for path in Manifest._get_entries()
+            if path not in disk_files and not is_pending_path(path, pending)
+        )
+
+        # Parents only move when the set of paths changed (new files or deletions)
+        if created_count or pages_to_delete:
+            pages = self.browse(path_to_id.values()) - pages_to_delete
+            self._link_parents_from_paths(pages, path_to_id)
+
         if created_count or updated_count:
             _logger.info(f"Sync complete: {created_count} created, {updated_count} updated.")
-            
-        # Pass 3: Prune (Delete records whose files are gone)
-        # We check all pages that have a file_path but that file_path wasn't found in current scan
-        # 'path_to_id' currently has all pages
-        
-        # Collect actual paths found on disk from 'all_files'
-        disk_paths = set(f[1] for f in all_files)
-        
-        deleted_count = 0
-        pages_to_delete = self.env['doc.page']
-        
-        for p in pages:
-            if not p.file_path: continue
-            
-            # If path not in disk_paths, it's deleted physically
-            if p.file_path not in disk_paths:
-                # Double check existence to be safe (maybe we missed it?)
-                full_path_check = os.path.join(repo_path, p.file_path)
-                if not os.path.exists(full_path_check):
-                    pages_to_delete += p
-        
-        if len(pages_to_delete) > 0:
-            deleted_count = len(pages_to_delete)
-            _logger.info(f"Pruning {deleted_count} orphaned records: {pages_to_delete.mapped('file_path')}")
-            # We call unlink, BUT we must ensure unlink doesn't fail trying to delete the missing file
-            # We already handled that in _delete_from_git with exists check.
-            pages_to_delete.unlink()
-            
-        if deleted_count:
-             _logger.info(f"Pruned {deleted_count} records.")
 
+        deleted_count = self._prune_missing_pages(pages_to_delete)
         return updated_count + created_count + deleted_count
 
-    def _delete_from_git(self):
+    @api.model
+    def _apply_disk_changes(self, changed_paths=(), deleted_paths=(), renamed_paths=()):
+        """
+        Incremental import of an explicit set of paths, e.g. from `git diff --name-status`.
+
+        The paths are only hints: deletions and renames are checked against
+        the disk before any page is pruned or moved.
+
+        :param changed_paths: relative paths that were added or modified
+        :param deleted_paths: relative paths that were removed
+        :param renamed_paths: (old_path, new_path) pairs; the page at old_path keeps
+                              its record id (and thus its doc:// links) and is moved
+        :return: number of records created, updated, moved or deleted
+        """
+        self = self.sudo().with_context(skip_file_path_compute=True)
+
         repo_path = self._get_git_repo_path()
-        if not repo_path:
-            return
-        full_path = os.path.join(repo_path, self.file_path)
-        if os.path.exists(full_path):
-            try:
-                os.remove(full_path)
-                # If directory is empty, remove it? 
-                # Complexity: if we delete parent with children, children are deleted in Odoo (cascade), 
-                # so we should delete their files too.
-            except OSError as e:
-                _logger.error(f"Failed to delete file {full_path}: {e}")
+        if not repo_path or not os.path.exists(repo_path):
+            return 0
+        self._lock_disk_import()
+
+        Manifest = self.env['doc.sync.manifest'].sudo()
+        path_to_id = self._get_path_to_id()
+        # Paths whose write-back is still pending keep the state committed in Odoo
+        pending = self.env['doc.writeback.pending'].sudo()._get_paths()
+        def exists(rel_path):
+            return os.path.exists(os.path.join(repo_path, rel_path))
+
+        changed = {p for p in changed_paths if self._is_syncable_path(p) and not is_pending_path(p, pending)}
+        deleted = {
+            p for p in deleted_paths
+            if self._is_syncable_path(p) and not is_pending_path(p, pending) and not exists(p)
+        }
+        renamed_paths = [
+            (old_path, new_path) for old_path, new_path in renamed_paths
+            if not is_pending_path(old_path, pending) and not is_pending_path(new_path, pending)
+        ]
+        # A rename whose old file is still there is just a new file
+        changed.update(new_path for old_path, new_path in renamed_paths if exists(old_path))
+        renamed_paths = [(old_path, new_path) for old_path, new_path in renamed_paths if not exists(old_path)]
+        moved_ids = set()
+
+        # Renames first, so a moved file is not pruned and recreated
+        for old_path, new_path in renamed_paths:
+            if not self._is_syncable_path(new_path):
+                deleted.add(old_path)
+                continue
+            changed.add(new_path)
+            page_id = path_to_id.get(old_path)
+            if not page_id or new_path in path_to_id:
+                deleted.add(old_path)
+                continue
+            # Don't write the old content back: the importer reads the new file below
+            self.browse(page_id).with_context(doc_from_disk=True).write({'file_path': new_path})
+            del path_to_id[old_path]
+            path_to_id[new_path] = page_id
+            moved_ids.add(page_id)
+            deleted.discard(old_path)
+        Manifest._remove_paths(old for old, new in renamed_paths)
+
+        disk_files = self._stat_disk_paths(repo_path, changed)
+        deleted |= changed - set(disk_files)
+        known_ids = set(path_to_id.values())
+        created_count, updated_count = self._import_disk_files(disk_files, path_to_id)
+        if moved_ids:
+            # Relative links of moved pages now resolve from their new directory
+            # (pages whose content changed were already re-synced by the import)
+            self.env['doc.page.link'].sudo()._sync(self.browse(moved_ids))
+
+        pages_to_delete = self.browse([path_to_id[p] for p in deleted if p in path_to_id])
+        Manifest._remove_paths(deleted)
+
+        # Relink moved/created pages, and existing pages whose parent file just appeared
+        new_ids = (set(path_to_id.values()) - known_ids) | moved_ids
+        new_dirs = {path[:-3] for path, page_id in path_to_id.items() if page_id in new_ids}
+        relink_ids = new_ids | {
+            page_id for path, page_id in path_to_id.items() if os.path.dirname(path) in new_dirs
+        }
+        pages = self.browse(relink_ids) - pages_to_delete
+        self._link_parents_from_paths(pages, path_to_id)
+
+        deleted_count = self._prune_missing_pages(pages_to_delete)
+        _logger.info(
+            f"Incremental sync: {created_count} created, {updated_count} updated, "
+            f"{len(moved_ids)} moved, {deleted_count} deleted."
+        )
+        return created_count + updated_count + len(moved_ids) + deleted_count
 
     def get_breadcrumbs(self):
         """Returns a list of dictionaries [{'id': id, 'name': name}] for ancestors"""
         self.ensure_one()
-        breadcrumbs = []
-        current = self.parent_id
-        while current:
-            breadcrumbs.insert(0, {'id': current.id, 'name': current.name})
-            current = current.parent_id
-        return breadcrumbs
+        ancestor_ids = [int(page_id) for page_id in (self.parent_path or '').split('/')[:-2]]
+        names = {page.id: page.name for page in self.search_fetch([('id', 'in', ancestor_ids)], ['name'])}
+        # Ancestors the user cannot see are skipped
+        return [{'id': page_id, 'name': names[page_id]} for page_id in ancestor_ids if page_id in names]
+
+    _NAV_TREE_FIELDS = ['name', 'parent_id', 'sequence', 'file_path']
+
+    @api.model
+    def get_nav_tree(self, parent_id=False, depth=None):
+        """Returns the page tree structure for the sidebar.
+
+        Visible pages are fetched with a single query and assembled in memory.
+        Trees are cached per user and structure version, except in transactions
+        that changed the structure themselves (their version is not committed).
+
+        :param parent_id: only return the children of this page (lazy loading)
+        :param depth: number of levels to return (all if None). Nodes whose
+                      children were not loaded have children_loaded False and
+                      has_children telling whether the client can expand them.
+        """
+        if 'doc.page.structure_changes' in self.env.cr.precommit.data:
+            return self._build_nav_tree(parent_id or False, depth or None)
+        return self._get_nav_tree_cached(self._get_structure_version(), parent_id or False, depth or None)
+
+    def _get_nav_tree_cached(self, version, parent_id, depth):
+        """Shared by the worker, for the latest structure version only. Do not mutate the result."""
+        key = (self.env.uid, self.env.su, parent_id, depth)
+        tree = _nav_tree_cache.get(self.env.cr.dbname, version, key)
+        if tree is None:
+            tree = self._build_nav_tree(parent_id, depth)
+            _nav_tree_cache.put(self.env.cr.dbname, version, tree, key)
+        return tree
+
+    def _build_nav_tree(self, parent_id, depth):
+        if not parent_id and not depth:
+            pages = self.search_fetch([], self._NAV_TREE_FIELDS, order='sequence, id')
+            boundary = self.browse()
+        else:
+            # Candidate ids (ignoring access rights) down to the requested depth:
+            # the level of a page is the number of ids in its parent_path
+            self.flush_model(['parent_path'])
+            prefix = self.sudo().browse(parent_id).parent_path if parent_id else ''
+            self.env.cr.execute("""
+                SELECT id, level - %(base_level)s
+                  FROM (SELECT id, length(parent_path) - length(replace(parent_path, '/', '')) AS level
+                          FROM doc_page
+                         WHERE parent_path LIKE %(subtree_like)s AND id != %(parent_id)s) AS pages
+                 WHERE %(depth)s::int IS NULL OR level - %(base_level)s <= %(depth)s
+            """, {
+                'subtree_like': escape_psql(prefix) + '%',
+                'base_level': prefix.count('/'),
+                'parent_id': parent_id or 0,
+                'depth': depth or None,
+            })
+            depth_by_id = dict(self.env.cr.fetchall())
+            pages = self.search_fetch([('id', 'in', list(depth_by_id))], self._NAV_TREE_FIELDS, order='sequence, id')
+            boundary = pages.filtered(lambda p: depth and depth_by_id[p.id] == depth)
+
+        nodes = self._get_nav_nodes(pages, boundary)
+        tree = []
+        for node in nodes.values():
+            if node['parent_id'] == parent_id:
+                tree.append(node)
+            elif node['parent_id'] in nodes:
+                parent = nodes[node['parent_id']]
+                parent['children'].append(node)
+                parent['has_children'] = True
+            # else: the parent is not visible, nor is the page in the sidebar
+        return tree
+
+    def _get_nav_nodes(self, pages, unexpanded):
+        """{id: sidebar node} of pages, children not attached.
+
+        :param unexpanded: pages whose children will not be sent along; their
+                           has_children is computed with one grouped query
+        """
+        expandable = set()
+        if unexpanded:
+            expandable = {
+                parent.id for parent, in self._read_group([('parent_id', 'in', unexpanded.ids)], ['parent_id'])
+            }
+        return {
+            page.id: {
+                'id': page.id,
+                'name': page.name,
+                'file_path': page.file_path,
+                'sequence': page.sequence,
+                'parent_id': page.parent_id.id,
+                'children': [],
+                'children_loaded': page not in unexpanded,
+                'has_children': page.id in expandable,
+            }
+            for page in pages
+        }
+
+    @api.model
+    def get_nav_tree_state(self, known_version=None, depth=None):
+        """Revalidate a client's sidebar against the current structure version.
+
+        Returns a dict with 'version' and either:
+        - 'not_modified': True when known_version is the current version,
+        - 'nodes' (flat list of changed or new nodes, without children) and
+          'removed' (ids of nodes to drop) since known_version,
+        - 'tree' (as get_nav_tree) when the client knows no usable version.
+        """
+        version = self._get_structure_version()
+        if known_version == version:
+            return {'version': version, 'not_modified': True}
+        Tombstone = self.env['doc.page.tombstone'].sudo()
+        if not known_version or known_version > version or known_version < Tombstone._get_horizon():
+            return {'version': version, 'tree': self.get_nav_tree(depth=depth)}
+
+        self.flush_model(['structure_version'])
+        self.env.cr.execute("SELECT id FROM doc_page WHERE structure_version > %s", [known_version])
+        changed_ids = [row[0] for row in self.env.cr.fetchall()]
+        pages = self.search_fetch([('id', 'in', changed_ids)], self._NAV_TREE_FIELDS, order='sequence, id')
+        # Pages that changed out of the user's sight (e.g. made private) disappear too
+        removed = (set(changed_ids) - set(pages.ids)) | set(Tombstone._get_removed_ids(known_version))
+        return {
+            'version': version,
+            'nodes': list(self._get_nav_nodes(pages, pages).values()),
+            'removed': sorted(removed),
+        }
+
+    @api.model
+    def _get_search_config(self):
+        """Text search configuration matching the user's language"""
+        return SEARCH_CONFIGS.get((self.env.lang or '').split('_')[0], DEFAULT_SEARCH_CONFIG)
 
     @api.model
-    def get_nav_tree(self):
-        """Returns the page tree structure for the sidebar"""
-        def build_tree(pages):
-            tree = []
-            for page in pages:
-                tree.append({
-                    'id': page.id,
-                    'name': page.name,
-                    'file_path': page.file_path,
-                    'children': build_tree(page.child_ids.sorted('sequence'))
-                })
-            return tree
-
-        root_pages = self.search([('parent_id', '=', False)], order='sequence, id')
-        return build_tree(root_pages)
+    def _get_search_vector(self, config):
+        """Weighted tsvector of title (A) and Markdown content (B), as indexed"""
+        assert config in SEARCH_CONFIGS.values()
+        return SQL(
+            f"setweight(to_tsvector('{config}', coalesce(doc_page.name, '')), 'A')"
+            f" || setweight(to_tsvector('{config}', coalesce(doc_page.content_md, '')), 'B')"
+        )
+
+    @api.model
+    def search_pages(self, query, limit=20, offset=0):
+        """Full-text search over titles and content, best matches first.
+
+        Accepts web-search syntax ("quoted phrases", -excluded, or). Returns
+        [{'id', 'name', 'parent_id': [id, name] or False, 'rank', 'snippet'}]
+        where snippet is escaped HTML with the matched words in <mark>.
+        """
+        if not (query or '').strip():
+            return []
+        config = self._get_search_config()
+        vector = self._get_search_vector(config)
+        # Access rules apply through the visible ids subquery
+        visible = self._search([])
+        headline_options = (
+            f'StartSel="{_HIGHLIGHT_START}", StopSel="{_HIGHLIGHT_STOP}", '
+            'MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter=" … "'
+        )
+        self.env.cr.execute(SQL("""
+            WITH q AS (SELECT websearch_to_tsquery(%(config)s::regconfig, %(query)s) AS query),
+            ranked AS (
+                SELECT doc_page.id, ts_rank_cd(%(vector)s, q.query) AS rank
+                  FROM doc_page, q
+                 WHERE %(vector)s @@ q.query
+                   AND doc_page.id IN %(visible)s
+                 ORDER BY rank DESC, doc_page.id
+                 LIMIT %(limit)s OFFSET %(offset)s
+            )
+            SELECT doc_page.id, doc_page.name, parent.id, parent.name, ranked.rank,
+                   ts_headline(%(config)s::regconfig, coalesce(doc_page.content_md, ''), q.query, %(options)s)
+              FROM ranked
+              JOIN doc_page ON doc_page.id = ranked.id
+              LEFT JOIN doc_page parent ON parent.id = doc_page.parent_id,
+                   q
+             ORDER BY ranked.rank DESC, doc_page.id
+        """,
+            config=config,
+            query=query,
+            vector=vector,
+            visible=visible.subselect(),
+            limit=limit,
+            offset=offset,
+            options=headline_options,
+        ))
+        results = []
+        for page_id, name, parent_id, parent_name, rank, headline in self.env.cr.fetchall():
+            snippet = str(escape(headline)) \
+                .replace(_HIGHLIGHT_START, '<mark>').replace(_HIGHLIGHT_STOP, '</mark>')
+            results.append({
+                'id': page_id,
+                'name': name,
+                'parent_id': [parent_id, parent_name] if parent_id else False,
+                'rank': rank,
+                'snippet': snippet,
+            })
+        return results
+
+    @api.model
+    def quick_open(self, term, limit=10):
+        """Typo-tolerant jump-to-page on titles and file paths.
+
+        Served by the trigram indexes of name and file_path (pg_trgm), or by
+        plain ilike matching when the extension is not available. Returns the
+        best `limit` matches as [{'id', 'name', 'file_path', 'breadcrumb'}],
+        breadcrumb being the titles of the visible ancestors, in one query.
+        """
+        term = (term or '').strip()
+        if not term:
+            return []
+        visible = self._search([]).subselect()
+        params = {'term': term, 'like': f'%{escape_psql(term)}%', 'prefix': f'{escape_psql(term)}%'}
+        if self.env.registry.has_trigram:
+            # The pg_trgm operators (<% and %) are standalone SQL objects: their
+            # escaped '%' then never goes through the placeholder formatting
+            word_similar, similar = SQL('<%%'), SQL('%%')
+            match = SQL(
+                "(%s %s doc_page.name OR doc_page.name %s %s"
+                " OR doc_page.name ILIKE %s OR doc_page.file_path ILIKE %s)",
+                term, word_similar, similar, term, params['like'], params['like'])
+            score = SQL(
+                "GREATEST(word_similarity(%(term)s, doc_page.name), similarity(doc_page.name, %(term)s),"
+                " word_similarity(%(term)s, doc_page.file_path))", term=term)
+        else:
+            match = SQL("(doc_page.name ILIKE %(like)s OR doc_page.file_path ILIKE %(like)s)", like=params['like'])
+            score = SQL("CASE WHEN doc_page.name ILIKE %(like)s THEN 1 ELSE 0 END", like=params['like'])
+        self.env.cr.execute(SQL("""
+            WITH matches AS (
+                SELECT doc_page.id, doc_page.name, doc_page.file_path, doc_page.parent_path,
+                       (doc_page.name ILIKE %(prefix)s) AS is_prefix, %(score)s AS score
+                  FROM doc_page
+                 WHERE %(match)s AND doc_page.id IN %(visible)s
+                 ORDER BY is_prefix DESC, score DESC, length(doc_page.name), doc_page.id
+                 LIMIT %(limit)s
+            )
+            SELECT matches.id, matches.name, matches.file_path,
+                   (SELECT string_agg(ancestor.name, ' / ' ORDER BY length(ancestor.parent_path))
+                      FROM doc_page ancestor
+                     WHERE ancestor.id = ANY(string_to_array(rtrim(matches.parent_path, '/'), '/')::int[])
+                       AND ancestor.id != matches.id
+                       AND ancestor.id IN %(visible)s)
+              FROM matches
+             ORDER BY matches.is_prefix DESC, matches.score DESC, length(matches.name), matches.id
+        """,
+            prefix=params['prefix'],
+            score=score,
+            match=match,
+            visible=visible,
+            limit=limit,
+        ))
+        return [
+            {'id': page_id, 'name': name, 'file_path': file_path, 'breadcrumb': breadcrumb or ''}
+            for page_id, name, file_path, breadcrumb in self.env.cr.fetchall()
+        ]
 
     @api.model
     def create_demo_data(self):
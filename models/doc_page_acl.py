@@ -0,0 +1,76 @@
+from odoo import models, fields, api
+from odoo.tools.sql import escape_psql
+
+
+class DocPageAcl(models.Model):
+    """Effective share permissions, one row per (user, page).
+
+    A share applies to its page and the whole subtree below it. Rows are
+    derived from doc.share and the page hierarchy (parent_path) and kept up to
+    date incrementally, so checking access is a single indexed lookup.
+    """
+    _name = 'doc.page.acl'
+    _description = 'Effective Page Permission'
+    _log_access = False
+
+    user_id = fields.Many2one('res.users', string='User', required=True, ondelete='cascade')
+    page_id = fields.Many2one('doc.page', string='Page', required=True, ondelete='cascade', index=True)
+    permission = fields.Selection([
+        ('read', 'Viewer'),
+        ('write', 'Editor')
+    ], string='Permission', required=True)
+
+    _sql_constraints = [
+        ('user_page_unique', 'unique(user_id, page_id)', 'Only one effective permission per user and page!')
+    ]
+
+    @api.model
+    def _refresh(self, pages=None, user_ids=None):
+        """Recompute the rows of the subtrees of pages (all pages if None),
+        for user_ids (all users if None), with one DELETE and one INSERT.
+
+        The permission of a user on a page is the most permissive of their
+        shares on the page and its ancestors.
+        """
+        self.env['doc.page'].flush_model(['parent_id', 'parent_path'])
+        self.env['doc.share'].flush_model(['page_id', 'user_id', 'permission'])
+        if pages is None:
+            subtree_likes = ['%']
+        else:
+            subtree_likes = [escape_psql(path) + '%' for path in set(pages.mapped('parent_path')) if path]
+            if not subtree_likes:
+                return
+        params = {
+            'subtree_likes': subtree_likes,
+            'user_ids': list(user_ids) if user_ids is not None else None,
+        }
+        self.env.cr.execute("""
+            DELETE FROM doc_page_acl acl
+             USING doc_page page
+             WHERE page.id = acl.page_id
+               AND page.parent_path LIKE ANY(%(subtree_likes)s)
+               AND (%(user_ids)s::int[] IS NULL OR acl.user_id = ANY(%(user_ids)s))
+        """, params)
+        self.env.cr.execute("""
+            INSERT INTO doc_page_acl (user_id, page_id, permission)
+            SELECT share.user_id, page.id,
+                   CASE WHEN bool_or(share.permission = 'write') THEN 'write' ELSE 'read' END
+              FROM doc_page page
+              JOIN doc_share share
+                ON share.page_id = ANY(string_to_array(rtrim(page.parent_path, '/'), '/')::int[])
+             WHERE page.parent_path LIKE ANY(%(subtree_likes)s)
+               AND (%(user_ids)s::int[] IS NULL OR share.user_id = ANY(%(user_ids)s))
+             GROUP BY share.user_id, page.id
+        """, params)
+        self.invalidate_model()
+
+    @api.model
+    def _get_permissions(self, user_id, page_ids):
+        """{page id: 'read' or 'write'} of the given pages shared with the user"""
+        if not page_ids:
+            return {}
+        self.env.cr.execute("""
+            SELECT page_id, permission FROM doc_page_acl
+             WHERE user_id = %s AND page_id = ANY(%s)
+        """, [user_id, list(page_ids)])
+        return dict(self.env.cr.fetchall())
@@ -0,0 +1,145 @@
+import os
+import re
+from collections import defaultdict
+from odoo import models, fields, api
+
+# [text](doc://123) and bare doc://123 references
+DOC_LINK_PATTERN = re.compile(r'doc://([0-9]+)')
+# [text](path/to/file.md), absolute (from the repository root) or relative
+PATH_LINK_PATTERN = re.compile(r'\[[^\]]+\]\(([^)]+\.md)\)')
+
+
+class DocPageLink(models.Model):
+    """Link graph between pages, one row per distinct link of a page.
+
+    Rows are diffed against the content on every change (see _sync). Path
+    links keep pointing at whatever page currently has their path: they are
+    re-resolved when pages are created, moved, renamed or deleted.
+    """
+    _name = 'doc.page.link'
+    _description = 'Page Link'
+    _log_access = False
+
+    source_id = fields.Many2one('doc.page', string='Source Page', required=True, ondelete='cascade', index=True)
+    target_id = fields.Many2one('doc.page', string='Target Page', ondelete='set null', index=True)
+    target_ref = fields.Char(string='Link', required=True, index=True,
+                             help="As written in the source: doc://<id> or a .md path")
+    target_path = fields.Char(string='Resolved Path', index=True,
+                              help="Path links: the target relative to the source's directory")
+    link_type = fields.Selection([
+        ('id', 'Page ID'),
+        ('path', 'File Path'),
+    ], string='Link Type', required=True)
+
+    _sql_constraints = [
+        ('source_ref_unique', 'unique(source_id, target_ref)', 'A link is only recorded once per page!')
+    ]
+
+    @api.model
+    def _parse_links(self, content, file_path):
+        """{target_ref: (link_type, target_path)} of the links of a Markdown text"""
+        links = {}
+        if not content:
+            return links
+        for page_id in DOC_LINK_PATTERN.findall(content):
+            links[f'doc://{page_id}'] = ('id', False)
+        current_dir = os.path.dirname(file_path) if file_path else ''
+        for ref in PATH_LINK_PATTERN.findall(content):
+            if '://' in ref:
+                continue
+            links[ref] = ('path', os.path.normpath(os.path.join(current_dir, ref)))
+        return links
+
+    @api.model
+    def _sync(self, pages):
+        """Bring the stored links of pages in line with their content.
+
+        Stored rows are fetched in one query and diffed with the parsed links:
+        only links that disappeared are deleted and only new ones inserted.
+        """
+        if not pages:
+            return
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT id, source_id, target_ref, target_path
+              FROM doc_page_link
+             WHERE source_id = ANY(%s)
+        """, [pages.ids])
+        stored = defaultdict(dict)
+        for link_id, source_id, target_ref, target_path in self.env.cr.fetchall():
+            stored[source_id][target_ref] = (link_id, target_path or False)
+
+        parsed = {page.id: self._parse_links(page.content_md, page.file_path) for page in pages}
+        target_ids = {
+            int(ref[len('doc://'):])
+            for links in parsed.values() for ref, (link_type, dummy) in links.items() if link_type == 'id'
+        }
+        existing_ids = set(self.env['doc.page'].sudo().browse(target_ids).exists().ids)
+        path_index = self.env['doc.page']._get_path_index()
+
+        to_delete = []
+        vals_list = []
+        for page in pages:
+            links = parsed[page.id]
+            for ref, (link_id, target_path) in stored[page.id].items():
+                # A moved source resolves its relative links elsewhere: recreate them
+                if ref not in links or links[ref][1] != target_path:
+                    to_delete.append(link_id)
+            for ref, (link_type, target_path) in links.items():
+                if ref in stored[page.id] and stored[page.id][ref][1] == target_path:
+                    continue
+                if link_type == 'id':
+                    target_id = int(ref[len('doc://'):])
+                    target_id = target_id if target_id in existing_ids else False
+                else:
+                    target_id = path_index.get(ref) or path_index.get(target_path) or False
+                vals_list.append({
+                    'source_id': page.id,
+                    'target_id': target_id,
+                    'target_ref': ref,
+                    'target_path': target_path,
+                    'link_type': link_type,
+                })
+        if to_delete:
+            self.browse(to_delete).unlink()
+        if vals_list:
+            self.create(vals_list)
+
+    @api.model
+    def _schedule_path_resolution(self, paths):
+        """Re-resolve the path links to paths once, right before this transaction commits"""
+        data = self.env.cr.precommit.data
+        changed_paths = data.get('doc.page.link.resolve')
+        if changed_paths is None:
+            changed_paths = data['doc.page.link.resolve'] = set()
+            env = self.env
+
+            @self.env.cr.precommit.add
+            def resolve():
+                env['doc.page.link']._resolve_path_links(changed_paths)
+        changed_paths.update(path for path in paths if path)
+
+    @api.model
+    def _resolve_path_links(self, paths):
+        """Point the path links to paths at the page now holding them (exact
+        path first, then relative to the source), in one indexed statement"""
+        if not paths:
+            return
+        self.env['doc.page'].flush_model(['file_path'])
+        self.flush_model()
+        self.env.cr.execute("""
+            WITH resolved AS (
+                SELECT link.id, COALESCE(exact.id, relative.id) AS target_id
+                  FROM doc_page_link link
+             LEFT JOIN doc_page exact ON exact.file_path = link.target_ref
+             LEFT JOIN doc_page relative ON relative.file_path = link.target_path
+                 WHERE link.link_type = 'path'
+                   AND (link.target_ref = ANY(%(paths)s) OR link.target_path = ANY(%(paths)s))
+            )
+            UPDATE doc_page_link link
+               SET target_id = resolved.target_id
+              FROM resolved
+             WHERE link.id = resolved.id
+               AND link.target_id IS DISTINCT FROM resolved.target_id
+        """, {'paths': sorted(paths)})
+        self.invalidate_model(['target_id'])
@@ -0,0 +1,47 @@
+from datetime import timedelta
+from odoo import models, fields, api
+
+# Tombstones older than this are purged; clients older than that get a full tree
+TOMBSTONE_RETENTION_DAYS = 30
+
+
+class DocPageTombstone(models.Model):
+    """Deleted pages, with the structure version of their deletion.
+
+    Lets get_nav_tree_state tell a client which sidebar nodes disappeared
+    since the version it knows.
+    """
+    _name = 'doc.page.tombstone'
+    _description = 'Deleted Page Marker'
+    _log_access = False
+    _order = 'version'
+
+    page_id = fields.Integer(string='Page ID', required=True)
+    version = fields.Integer(string='Structure Version', required=True, index=True)
+    deleted_at = fields.Datetime(string='Deleted At', default=fields.Datetime.now)
+
+    @api.model
+    def _record_deletions(self, page_ids, version):
+        if page_ids:
+            self.create([{'page_id': page_id, 'version': version} for page_id in page_ids])
+
+    @api.model
+    def _get_removed_ids(self, since_version):
+        self.env.cr.execute(
+            "SELECT DISTINCT page_id FROM doc_page_tombstone WHERE version > %s", [since_version])
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _get_horizon(self):
+        """Oldest version from which deltas are complete (older tombstones are gone)"""
+        return int(self.env['ir.config_parameter'].sudo().get_param('odoo_doc_studio.nav_tree_horizon', 0))
+
+    @api.autovacuum
+    def _gc_tombstones(self):
+        limit_date = fields.Datetime.now() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        self.env.cr.execute(
+            "DELETE FROM doc_page_tombstone WHERE deleted_at < %s RETURNING version", [limit_date])
+        versions = [row[0] for row in self.env.cr.fetchall()]
+        if versions:
+            horizon = max(max(versions), self._get_horizon())
+            self.env['ir.config_parameter'].sudo().set_param('odoo_doc_studio.nav_tree_horizon', horizon)
@@ -1,11 +1,11 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 class DocShare(models.Model):
     _name = 'doc.share'
     _description = 'Document Share'
     
     page_id = fields.Many2one('doc.page', string='Document', required=True, ondelete='cascade')
-    user_id = fields.Many2one('res.users', string='Shared With', required=True)
+    user_id = fields.Many2one('res.users', string='Shared With', required=True, index=True)
     permission = fields.Selection([
         ('read', 'Viewer'),
         ('write', 'Editor')
@@ -14,3 +14,28 @@ class DocShare(models.Model):
     _sql_constraints = [
         ('unique_share', 'unique(page_id, user_id)', 'User already has access to this document')
     ]
+
+    # Shares apply to the whole subtree of their page: refresh the effective
+    # permissions (doc.page.acl) and the sidebar structure version below it.
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        shares = super().create(vals_list)
+        shares._refresh_page_access(shares.page_id, shares.user_id)
+        return shares
+
+    def write(self, vals):
+        pages, users = self.page_id, self.user_id
+        res = super().write(vals)
+        self._refresh_page_access(pages | self.page_id, users | self.user_id)
+        return res
+
+    def unlink(self):
+        pages, users = self.page_id, self.user_id
+        res = super().unlink()
+        self._refresh_page_access(pages, users)
+        return res
+
+    def _refresh_page_access(self, pages, users):
+        self.env['doc.page.acl'].sudo()._refresh(pages, users.ids)
+        self.env['doc.page'].sudo().search([('id', 'child_of', pages.ids)])._mark_structure_changed()
@@ -0,0 +1,142 @@
+import os
+from odoo import models, fields, api
+from odoo.tools import split_every
+from odoo.tools.sql import escape_psql
+
+from .doc_frontmatter import new_content_digest
+
+
+class DocSyncManifest(models.Model):
+    """Fingerprint of every Markdown file seen on disk.
+
+    The importer only stats the repository and compares (mtime, size) with the
+    stored values; files are re-read only when their fingerprint changed, and
+    re-imported only when their content hash changed.
+    """
+    _name = 'doc.sync.manifest'
+    _description = 'Disk Sync Manifest'
+    _rec_name = 'file_path'
+    _log_access = False
+
+    file_path = fields.Char(string='File Path', required=True, index=True)
+    mtime = fields.Float(string='Modification Time')
+    size = fields.Integer(string='Size (bytes)')
+    content_hash = fields.Char(string='Content Hash')
+    page_id = fields.Many2one('doc.page', string='Page', ondelete='cascade', index=True)
+
+    _sql_constraints = [
+        ('file_path_unique', 'unique(file_path)', 'A file can only appear once in the sync manifest!')
+    ]
+
+    @api.model
+    def _hash_content(self, data):
+        """Content hash used to detect real changes behind a new mtime"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = new_content_digest()
+        digest.update(data)
+        return digest.hexdigest()
+
+    @api.model
+    def _get_entries(self, paths=None):
+        """Return {file_path: {mtime, size, content_hash, page_id}} in one query
+
+        :param paths: restrict to these paths (default: the whole manifest)
+        """
+        if paths is None:
+            self.env.cr.execute("""
+                SELECT file_path, mtime, size, content_hash, page_id
+                  FROM doc_sync_manifest
+            """)
+        else:
+            self.env.cr.execute("""
+                SELECT file_path, mtime, size, content_hash, page_id
+                  FROM doc_sync_manifest
+                 WHERE file_path = ANY(%s)
+            """, [list(paths)])
+        return {
+            path: {'mtime': mtime, 'size': size, 'content_hash': content_hash, 'page_id': page_id}
+            for path, mtime, size, content_hash, page_id in self.env.cr.fetchall()
+        }
+
+    @api.model
+    def _upsert_entries(self, entries):
+        """Insert or refresh manifest rows.
+
+        :param entries: iterable of dicts with file_path, mtime, size, content_hash
+                        and page_id keys. A falsy (or since deleted) page_id keeps
+                        the stored one.
+        """
+        entries = list(entries)
+        for chunk in split_every(500, entries):
+            params = []
+            for entry in chunk:
+                params.extend([
+                    entry['file_path'], entry.get('mtime'), entry.get('size'),
+                    entry.get('content_hash'), entry.get('page_id') or None,
+                ])
+            self.env.cr.execute(f"""
+                INSERT INTO doc_sync_manifest (file_path, mtime, size, content_hash, page_id)
+                VALUES {", ".join(["(%s, %s, %s, %s, (SELECT id FROM doc_page WHERE id = %s))"] * len(chunk))}
+                ON CONFLICT (file_path) DO UPDATE
+                   SET mtime = EXCLUDED.mtime,
+                       size = EXCLUDED.size,
+                       content_hash = EXCLUDED.content_hash,
+                       page_id = COALESCE(EXCLUDED.page_id, doc_sync_manifest.page_id)
+            """, params)
+        if entries:
+            self.invalidate_model()
+
+    @api.model
+    def _move_paths(self, old_path, new_path):
+        """Follow a page (old_path) and its directory (old_path without .md) being moved"""
+        old_dir = old_path[:-3] + '/'
+        new_dir = new_path[:-3] + '/'
+        params = {
+            'old_path': old_path,
+            'new_path': new_path,
+            'old_dir': old_dir,
+            'new_dir': new_dir,
+            'old_dir_like': escape_psql(old_dir) + '%',
+        }
+        new_path_sql = """
+            CASE WHEN file_path = %(old_path)s THEN %(new_path)s
+                 ELSE %(new_dir)s || substr(file_path, length(%(old_dir)s) + 1) END
+        """
+        # Entries already sitting on the target paths are superseded
+        self.env.cr.execute(f"""
+            DELETE FROM doc_sync_manifest
+             WHERE file_path IN (SELECT {new_path_sql} FROM doc_sync_manifest
+                                  WHERE file_path = %(old_path)s OR file_path LIKE %(old_dir_like)s)
+               AND NOT (file_path = %(old_path)s OR file_path LIKE %(old_dir_like)s)
+        """, params)
+        self.env.cr.execute(f"""
+            UPDATE doc_sync_manifest SET file_path = {new_path_sql}
+             WHERE file_path = %(old_path)s OR file_path LIKE %(old_dir_like)s
+        """, params)
+        self.invalidate_model()
+
+    @api.model
+    def _remove_paths(self, paths):
+        paths = list(paths)
+        if paths:
+            self.env.cr.execute("DELETE FROM doc_sync_manifest WHERE file_path = ANY(%s)", [paths])
+            self.invalidate_model()
+
+    @api.model
+    def _record_file(self, rel_path, full_path, data=None, page_id=False, content_hash=None):
+        """Refresh the entry of a file Odoo itself just wrote (or read), so the next scan skips it
+
+        :param content_hash: hash of the file, if already known (data is not needed then)
+        """
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return
+        self._upsert_entries([{
+            'file_path': rel_path,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'content_hash': content_hash or self._hash_content(data),
+            'page_id': page_id,
+        }])
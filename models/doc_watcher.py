@@ -0,0 +1,230 @@
+import logging
+import os
+import threading
+import time
+from odoo import models, api, sql_db, SUPERUSER_ID
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+    inotify_flags = None
+
+DEFAULT_DEBOUNCE = 2.0
+# Polling fallback, and how often non-leader workers retry to become the watcher
+POLL_INTERVAL = 10.0
+LEADER_RETRY_INTERVAL = 60.0
+
+# One watcher thread per database and process
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+class DiskWatcher(threading.Thread):
+    """Watches the Markdown mirror and feeds the changes to doc.page._apply_disk_changes.
+
+    Every worker starts one, but only the holder of a session-level advisory
+    lock (kept on a dedicated connection) actually watches: the others retry
+    periodically, taking over when the leader stops watching (the lock is released
+    explicitly) or its process goes away.
+
+    Events are batched: a batch is imported once no new event arrived for the
+    debounce window (and at the latest after ten windows).
+    """
+
+    def __init__(self, dbname, debounce=DEFAULT_DEBOUNCE):
+        super().__init__(name=f'doc_watcher.{dbname}', daemon=True)
+        self.dbname = dbname
+        self.debounce = debounce
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            lock_cr = None
+            is_leader = False
+            try:
+                lock_cr = sql_db.db_connect(self.dbname).cursor()
+                lock_cr.execute("SELECT pg_try_advisory_lock(hashtext('doc_studio_disk_watcher'))")
+                is_leader = lock_cr.fetchone()[0]
+                # The lock is session-level: end the transaction right away, so the
+                # connection does not stay idle in transaction (holding back vacuum)
+                lock_cr.commit()
+                if is_leader:
+                    repo_path = self._read_config()
+                    if repo_path and os.path.isdir(repo_path):
+                        _logger.info(f"Doc Studio watcher started on {repo_path}")
+                        if INotify is not None:
+                            self._watch_inotify(repo_path)
+                        else:
+                            self._watch_polling(repo_path)
+            except Exception:
+                _logger.exception("Doc Studio watcher failed")
+            finally:
+                if lock_cr is not None:
+                    # The connection goes back to the pool (it is not closed):
+                    # release the leadership explicitly
+                    try:
+                        if is_leader:
+                            lock_cr.execute("SELECT pg_advisory_unlock(hashtext('doc_studio_disk_watcher'))")
+                            lock_cr.commit()
+                    except Exception:
+                        _logger.exception("Doc Studio watcher could not release its lock")
+                    finally:
+                        lock_cr.close()
+            self.stop_event.wait(LEADER_RETRY_INTERVAL)
+
+    def _read_config(self):
+        with Registry(self.dbname).cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            if not env['doc.disk.watcher']._is_enabled():
+                self.stop()
+                return None
+            return env['doc.page']._get_git_repo_path()
+
+    def _still_enabled(self):
+        return self._read_config() is not None
+
+    def _apply(self, changed=(), deleted=(), renamed=(), full=False):
+        try:
+            with Registry(self.dbname).cursor() as cr:
+                Page = api.Environment(cr, SUPERUSER_ID, {})['doc.page']
+                if full:
+                    count = Page.sync_all_from_disk()
+                else:
+                    count = Page._apply_disk_changes(
+                        changed_paths=sorted(changed), deleted_paths=sorted(deleted), renamed_paths=renamed)
+            if count:
+                _logger.info(f"Doc Studio watcher: {count} pages synced from disk.")
+        except Exception:
+            _logger.exception("Doc Studio watcher could not import disk changes")
+
+    def _watch_polling(self, repo_path):
+        """Fallback without inotify: diff successive stat snapshots of the tree"""
+        def scan():
+            with Registry(self.dbname).cursor() as cr:
+                disk_files = api.Environment(cr, SUPERUSER_ID, {})['doc.page']._scan_disk_tree(repo_path)
+            return {path: (mtime, size) for path, (dummy, mtime, size) in disk_files.items()}
+
+        snapshot = scan()
+        while not self.stop_event.wait(POLL_INTERVAL):
+            if not self._still_enabled():
+                return
+            current = scan()
+            changed = {path for path, fingerprint in current.items() if snapshot.get(path) != fingerprint}
+            deleted = set(snapshot) - set(current)
+            if changed or deleted:
+                self._apply(changed, deleted)
+            snapshot = current
+
+    def _watch_inotify(self, repo_path):
+        mask = (inotify_flags.CREATE | inotify_flags.CLOSE_WRITE | inotify_flags.MODIFY | inotify_flags.DELETE
+                | inotify_flags.MOVED_FROM | inotify_flags.MOVED_TO)
+        inotify = INotify()
+        watched_dirs = {}
+
+        def watch_tree(rel_dir):
+            for root, dirs, dummy in os.walk(os.path.join(repo_path, rel_dir)):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                try:
+                    wd = inotify.add_watch(root, mask)
+                except OSError:
+                    continue
+                watched_dirs[wd] = os.path.relpath(root, repo_path)
+
+        try:
+            watch_tree('')
+            changed, deleted, renamed = set(), set(), []
+            moved_from = {}
+            full_resync = False
+            batch_started = None
+            last_check = time.monotonic()
+
+            while not self.stop_event.is_set():
+                pending = changed or deleted or renamed or moved_from or full_resync
+                events = inotify.read(timeout=int(self.debounce * 1000) if pending else 1000)
+                now = time.monotonic()
+                if events and batch_started is None:
+                    batch_started = now
+                timed_out = batch_started is not None and now - batch_started > 10 * self.debounce
+                if pending and (not events or timed_out):
+                    # Moves out of the tree are deletions
+                    deleted.update(moved_from.values())
+                    self._apply(changed, deleted, renamed, full=full_resync)
+                    changed, deleted, renamed = set(), set(), []
+                    moved_from = {}
+                    full_resync = False
+                    batch_started = now if events else None
+                if now - last_check > LEADER_RETRY_INTERVAL:
+                    last_check = now
+                    if not self._still_enabled():
+                        return
+
+                for event in events:
+                    if event.mask & inotify_flags.IGNORED:
+                        watched_dirs.pop(event.wd, None)
+                        continue
+                    rel_dir = watched_dirs.get(event.wd)
+                    if rel_dir is None or not event.name or event.name.startswith('.'):
+                        continue
+                    rel_path = os.path.normpath(os.path.join(rel_dir, event.name))
+                    if event.mask & inotify_flags.ISDIR:
+                        if event.mask & (inotify_flags.CREATE | inotify_flags.MOVED_TO):
+                            watch_tree(rel_path)
+                        # Whole directories appearing or disappearing: rescan (rare)
+                        full_resync = True
+                        continue
+                    if not rel_path.endswith('.md'):
+                        continue
+                    if event.mask & inotify_flags.MOVED_FROM:
+                        moved_from[event.cookie] = rel_path
+                    elif event.mask & inotify_flags.MOVED_TO and event.cookie in moved_from:
+                        renamed.append((moved_from.pop(event.cookie), rel_path))
+                    elif event.mask & inotify_flags.DELETE:
+                        deleted.add(rel_path)
+                        changed.discard(rel_path)
+                    else:
+                        changed.add(rel_path)
+                        deleted.discard(rel_path)
+        finally:
+            inotify.close()
+
+
+class DocDiskWatcher(models.AbstractModel):
+    """Starts the optional disk watcher (odoo_doc_studio.watcher_enabled)"""
+    _name = 'doc.disk.watcher'
+    _description = 'Disk Watcher'
+
+    @api.model
+    def _is_enabled(self):
+        return self.env['ir.config_parameter'].sudo().get_param('odoo_doc_studio.watcher_enabled') == 'True'
+
+    @api.model
+    def _get_debounce(self):
+        try:
+            return float(self.env['ir.config_parameter'].sudo().get_param(
+                'odoo_doc_studio.watcher_debounce', DEFAULT_DEBOUNCE))
+        except ValueError:
+            return DEFAULT_DEBOUNCE
+
+    @api.model
+    def _start(self):
+        if config['test_enable'] or config['stop_after_init'] or not self._is_enabled():
+            return
+        dbname = self.env.cr.dbname
+        with _watchers_lock:
+            watcher = _watchers.get(dbname)
+            if watcher and watcher.is_alive() and not watcher.stop_event.is_set():
+                return
+            watcher = _watchers[dbname] = DiskWatcher(dbname, self._get_debounce())
+            watcher.start()
+
+    def _register_hook(self):
+        super()._register_hook()
+        self._start()
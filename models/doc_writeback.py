@@ -0,0 +1,279 @@
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from odoo import models, api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+# A single thread, so background write-backs hit the disk in commit order
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='doc_writeback')
+        return _executor
+
+
+FSYNC_POLICIES = [
+    ('none', 'None (fastest)'),
+    ('file', 'File'),
+    ('full', 'File and directory'),
+]
+
+
+def write_mirror_file(full_path, data, fsync='none'):
+    """Atomically write one Markdown file of the mirror. Returns success.
+
+    The content goes to a hidden temp file in the target directory which is
+    then renamed over the target, so readers (disk sync, git) never see a
+    truncated file. Nothing is written when the file already holds the same
+    bytes, avoiding I/O and spurious git changes.
+
+    :param fsync: 'none', 'file' (fsync the data before the rename) or
+                  'full' (also fsync the directory, making the rename durable)
+    """
+    payload = data.encode('utf-8')
+    try:
+        if os.path.getsize(full_path) == len(payload):
+            with open(full_path, 'rb') as f:
+                if f.read() == payload:
+                    return True
+    except OSError:
+        pass
+
+    directory = os.path.dirname(full_path)
+    tmp_path = None
+    try:
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+            try:
+                os.chmod(directory, 0o777)
+            except OSError: pass
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(full_path)}.", suffix='.tmp', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            if fsync in ('file', 'full'):
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, 0o666)
+        except OSError:
+            pass
+        os.replace(tmp_path, full_path)
+        tmp_path = None
+
+        if fsync == 'full':
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        return True
+    except OSError as e:
+        _logger.error(f"Failed to write file {full_path}: {e}")
+        return False
+    finally:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def delete_mirror_file(full_path):
+    """Remove a file of the mirror, or a directory once it is empty"""
+    if os.path.isdir(full_path):
+        try:
+            os.rmdir(full_path)
+        except OSError:
+            # Still holds files Odoo does not manage
+            pass
+        return
+    if os.path.exists(full_path):
+        try:
+            os.remove(full_path)
+        except OSError as e:
+            _logger.error(f"Failed to delete file {full_path}: {e}")
+
+
+def move_mirror_path(old_full_path, new_full_path):
+    """Move a file or a whole directory of the mirror with a single rename.
+
+    When the target directory already exists, the old tree is merged into it.
+    """
+    if not os.path.exists(old_full_path):
+        return
+    try:
+        if not os.path.exists(new_full_path):
+            os.makedirs(os.path.dirname(new_full_path), exist_ok=True)
+            os.rename(old_full_path, new_full_path)
+        elif os.path.isdir(old_full_path) and os.path.isdir(new_full_path):
+            for root, dirs, files in os.walk(old_full_path, topdown=False):
+                target_root = os.path.join(new_full_path, os.path.relpath(root, old_full_path))
+                os.makedirs(target_root, exist_ok=True)
+                for filename in files:
+                    os.replace(os.path.join(root, filename), os.path.join(target_root, filename))
+                os.rmdir(root)
+        else:
+            _logger.warning(f"Not moving {old_full_path}: {new_full_path} already exists")
+    except OSError as e:
+        _logger.error(f"Failed to move {old_full_path} to {new_full_path}: {e}")
+
+
+def lock_disk_import(cr, wait=True):
+    """Transaction-level lock taken by disk imports and by the write-back of
+    files, so an import never sees the mirror half-way through a write-back.
+
+    :param wait: when False, return False instead of waiting for the lock
+    """
+    if wait:
+        cr.execute("SELECT pg_advisory_xact_lock(hashtext('doc_page_disk_import'))")
+        return True
+    cr.execute("SELECT pg_try_advisory_xact_lock(hashtext('doc_page_disk_import'))")
+    return cr.fetchone()[0]
+
+
+def _apply_operations(registry, operations, fsync='none', token=None, wait=True):
+    """Run queued file operations, then refresh the manifest of written files.
+
+    Runs after the commit (or in the write-back thread): it must not use the
+    committed cursor, so it works in a fresh one, holding the disk import lock
+    until the manifest is up to date and the pending markers are cleared.
+
+    :return: False if wait is False and an import holds the lock (nothing done)
+    """
+    with registry.cursor() as cr:
+        if not lock_disk_import(cr, wait):
+            return False
+        entries = []
+        for operation in operations:
+            if operation[0] == 'delete':
+                delete_mirror_file(operation[1])
+                continue
+            if operation[0] == 'move':
+                move_mirror_path(operation[1], operation[2])
+                continue
+            dummy, rel_path, full_path, data, page_id = operation
+            if not write_mirror_file(full_path, data, fsync):
+                continue
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue
+            entries.append({
+                'file_path': rel_path,
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'data': data,
+                'page_id': page_id,
+            })
+
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        Manifest = env['doc.sync.manifest']
+        for entry in entries:
+            entry['content_hash'] = Manifest._hash_content(entry.pop('data'))
+        Manifest._upsert_entries(entries)
+        if token:
+            env['doc.writeback.pending']._done(token)
+    return True
+
+
+def _apply_operations_safe(registry, operations, fsync='none', token=None, wait=True):
+    try:
+        return _apply_operations(registry, operations, fsync, token, wait)
+    except Exception:
+        _logger.exception("Write-back failed")
+        return True
+
+
+class DocWritebackQueue(models.AbstractModel):
+    """Coalesces disk writes of doc.page records.
+
+    Pages are marked dirty during the transaction; right before commit each
+    dirty page is rendered once, and the files are written after the commit
+    succeeds (optionally by a background thread, see the
+    odoo_doc_studio.writeback_mode parameter). The paths involved are marked
+    in doc.writeback.pending by the same transaction, until they are written.
+    """
+    _name = 'doc.writeback.queue'
+    _description = 'Disk Write-back Queue'
+
+    @api.model
+    def _get_fsync_policy(self):
+        return self.env['ir.config_parameter'].sudo().get_param('odoo_doc_studio.fsync_policy', 'none')
+
+    @api.model
+    def _get_queue(self):
+        data = self.env.cr.precommit.data
+        queue = data.get('doc.writeback')
+        if queue is None:
+            # 'operations': deletes and moves, in the order they happened
+            queue = data['doc.writeback'] = {'page_ids': set(), 'operations': []}
+            env = self.env
+
+            @self.env.cr.precommit.add
+            def prepare():
+                env['doc.writeback.queue']._prepare_operations(queue)
+        return queue
+
+    @api.model
+    def _enqueue_pages(self, pages):
+        if pages:
+            self._get_queue()['page_ids'].update(pages.ids)
+
+    @api.model
+    def _enqueue_deletes(self, full_paths):
+        if full_paths:
+            self._get_queue()['operations'].extend(('delete', full_path) for full_path in full_paths)
+
+    @api.model
+    def _enqueue_move(self, old_full_path, new_full_path):
+        self._get_queue()['operations'].append(('move', old_full_path, new_full_path))
+
+    @api.model
+    def _prepare_operations(self, queue):
+        """Precommit: render every dirty page once, apply the files after commit"""
+        Page = self.env['doc.page'].sudo()
+        pages = Page.browse(queue['page_ids']).exists()
+        repo_path = Page._get_git_repo_path()
+
+        # Deletions and moves first: a page may take over a path another one left
+        operations = list(queue['operations'])
+        for page in pages:
+            if not page.file_path:
+                continue
+            operations.append((
+                'write', page.file_path, os.path.join(repo_path, page.file_path),
+                page._render_file_content(), page.id,
+            ))
+        if not operations:
+            return
+
+        # Until the files are written, importers must not trust the disk on these paths
+        token = uuid.uuid4().hex
+        self.env['doc.writeback.pending'].sudo()._add(token, [
+            os.path.relpath(path, repo_path)
+            for operation in operations
+            for path in ([operation[2]] if operation[0] == 'write' else operation[1:])
+        ])
+
+        background = self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_doc_studio.writeback_mode', 'commit') == 'background'
+        fsync = self._get_fsync_policy()
+        registry = self.env.registry
+
+        @self.env.cr.postcommit.add
+        def apply():
+            # A running import holds the lock: rather than blocking the request
+            # until it ends, let the write-back thread wait for it
+            if background or not _apply_operations_safe(registry, operations, fsync, token, wait=False):
+                _get_executor().submit(_apply_operations_safe, registry, operations, fsync, token)
@@ -0,0 +1,58 @@
+import os
+from datetime import timedelta
+from odoo import models, fields, api
+
+# Markers older than this are from a write-back that never ran (server
+# stopped with a queue): the importer no longer waits for them
+PENDING_TIMEOUT_MINUTES = 60
+
+
+def is_pending_path(rel_path, pending_paths):
+    """Whether rel_path, or one of its directories, is in pending_paths"""
+    while rel_path:
+        if rel_path in pending_paths:
+            return True
+        rel_path = os.path.dirname(rel_path)
+    return False
+
+
+class DocWritebackPending(models.Model):
+    """Mirror paths with file operations committed but not applied yet.
+
+    Rows are inserted by the transaction that queues the operations and
+    removed by the write-back once the files are on disk. In between, the
+    disk still shows the previous state: importers leave these paths (and
+    everything below them) alone instead of pruning the pages or importing
+    their old files as new pages.
+    """
+    _name = 'doc.writeback.pending'
+    _description = 'Pending Disk Write-back'
+    _log_access = False
+
+    token = fields.Char(string='Write-back', required=True, index=True)
+    path = fields.Char(string='Path', required=True, help="Relative to the repository, file or directory")
+    queued_at = fields.Datetime(string='Queued At', required=True)
+
+    @api.model
+    def _add(self, token, paths):
+        paths = sorted(set(paths))
+        if paths:
+            self.env.cr.execute("""
+                INSERT INTO doc_writeback_pending (token, path, queued_at)
+                SELECT %s, unnest(%s::varchar[]), %s
+            """, [token, paths, fields.Datetime.now()])
+
+    @api.model
+    def _done(self, token):
+        self.env.cr.execute("DELETE FROM doc_writeback_pending WHERE token = %s", [token])
+
+    @api.model
+    def _get_paths(self):
+        limit_date = fields.Datetime.now() - timedelta(minutes=PENDING_TIMEOUT_MINUTES)
+        self.env.cr.execute("SELECT DISTINCT path FROM doc_writeback_pending WHERE queued_at >= %s", [limit_date])
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    @api.autovacuum
+    def _gc_pending(self):
+        limit_date = fields.Datetime.now() - timedelta(minutes=PENDING_TIMEOUT_MINUTES)
+        self.env.cr.execute("DELETE FROM doc_writeback_pending WHERE queued_at < %s", [limit_date])
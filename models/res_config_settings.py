@@ -1,5 +1,8 @@
 from odoo import fields, models
 
+from .doc_markdown import MARKDOWN_BACKENDS, DEFAULT_BACKEND
+from .doc_writeback import FSYNC_POLICIES
+
 class ResConfigSettings(models.TransientModel):
     _inherit = 'res.config.settings'
 
@@ -16,6 +19,59 @@ class ResConfigSettings(models.TransientModel):
         help="HTTPS/SSH URL of the Git repository to clone (Features coming soon)."
     )
 
+    doc_studio_markdown_backend = fields.Selection(
+        MARKDOWN_BACKENDS,
+        string="Markdown Renderer",
+        default=DEFAULT_BACKEND,
+        config_parameter='odoo_doc_studio.markdown_backend',
+        help="Engine used to render Markdown to HTML. Falls back to Python-Markdown "
+             "when the selected library is not installed on the server."
+    )
+
+    doc_studio_writeback_mode = fields.Selection(
+        [('commit', 'After each save'), ('background', 'Background thread')],
+        string="Disk Write-back",
+        default='commit',
+        config_parameter='odoo_doc_studio.writeback_mode',
+        help="Modified pages are written to disk once per save, after the transaction commits. "
+             "'Background thread' hands the writes off so saves return without waiting for the disk."
+    )
+
+    doc_studio_fsync_policy = fields.Selection(
+        FSYNC_POLICIES,
+        string="Disk Durability (fsync)",
+        default='none',
+        config_parameter='odoo_doc_studio.fsync_policy',
+        help="Files are always replaced atomically. fsync additionally makes them survive "
+             "a power loss, at the cost of slower writes."
+    )
+
+    doc_studio_watcher_enabled = fields.Boolean(
+        string="Watch Disk Changes",
+        config_parameter='odoo_doc_studio.watcher_enabled',
+        help="Import changes made to the Markdown files within seconds (inotify on Linux, "
+             "polling otherwise). One worker watches at a time; applies to workers started afterwards."
+    )
+
+    doc_studio_watcher_debounce = fields.Float(
+        string="Watcher Debounce (s)",
+        default=2.0,
+        config_parameter='odoo_doc_studio.watcher_debounce',
+        help="Changes are imported once the files stayed untouched for this long."
+    )
+
+    doc_studio_sync_io_workers = fields.Integer(
+        string="Disk Import Threads",
+        default=4,
+        config_parameter='odoo_doc_studio.sync_io_workers',
+        help="Files read in parallel when importing from disk (1 to 32). Raise it for "
+             "network mounts (NFS), where each file access waits on the network."
+    )
+
+    def set_values(self):
+        super().set_values()
+        self.env['doc.disk.watcher']._start()
+
     def action_git_push(self):
         msg = self.env['doc.git.manager'].git_commit_push()
         return {
@@ -23,15 +23,16 @@ export class DocContent extends Component {
             editContent: '',
             editTitle: '',
             editParentId: false,
-            availableParents: [],
+            parentSearchTerm: '',
+            parentResults: [],
             linkedPages: [],
+            backlinks: [],
             breadcrumbs: [],
             readingTime: 0,
             showCodeView: false,
         });
 
         onWillStart(async () => {
-            await this.loadParents();
             await this.loadDoc(this.props.docId);
         });
 
@@ -52,14 +53,32 @@ export class DocContent extends Component {
         }
     }
 
-    async loadParents() {
+    async searchParents(term) {
         try {
-            this.state.availableParents = await this.orm.searchRead("doc.page", [], ["id", "name"]);
+            const results = term ? await this.orm.call("doc.page", "quick_open", [term], { limit: 8 }) : [];
+            // A page cannot become its own parent
+            this.state.parentResults = results.filter((page) => page.id !== this.state.doc?.id);
         } catch (error) {
-            console.error("Error loading parents:", error);
+            console.error("Error searching parents:", error);
         }
     }
 
+    onParentInput(ev) {
+        this.state.parentSearchTerm = ev.target.value;
+        if (!this.state.parentSearchTerm) {
+            this.selectParent(null);
+            return;
+        }
+        if (this.parentSearchTimeout) clearTimeout(this.parentSearchTimeout);
+        this.parentSearchTimeout = setTimeout(() => this.searchParents(this.state.parentSearchTerm), 200);
+    }
+
+    selectParent(page) {
+        this.state.editParentId = page ? String(page.id) : '';
+        this.state.parentSearchTerm = page ? page.name : '';
+        this.state.parentResults = [];
+    }
+
     async loadDoc(docId) {
         if (!docId) {
             this.state.doc = null;
@@ -68,8 +87,8 @@ export class DocContent extends Component {
         this.state.isLoading = true;
         this.state.mode = 'view';
         try {
-            // Smart Sync: Ensure DB is consistent with Disk before reading
-            await this.orm.call("doc.page", "action_sync_from_disk", [docId]);
+            // Smart Sync: re-read the file first, only if it changed on disk
+            await this.orm.call("doc.page", "action_sync_from_disk_if_stale", [docId]);
 
             const result = await this.orm.read("doc.page", [docId], [
                 "name", "body_html", "content_md", "parent_id", "linked_page_ids",
@@ -106,6 +125,8 @@ export class DocContent extends Component {
                 // Sync title/parent for edit mode
                 this.state.editTitle = this.state.doc.name;
                 this.state.editParentId = this.state.doc.parent_id ? String(this.state.doc.parent_id[0]) : '';
+                this.state.parentSearchTerm = this.state.doc.parent_id ? this.state.doc.parent_id[1] : '';
+                this.state.parentResults = [];
 
                 // Load linked page details (names)
                 if (this.state.doc.linked_page_ids && this.state.doc.linked_page_ids.length > 0) {
@@ -119,6 +140,9 @@ export class DocContent extends Component {
                     this.state.linkedPages = [];
                 }
 
+                // Pages linking here
+                this.state.backlinks = await this.orm.call("doc.page", "get_backlinks", [docId], { limit: 50 });
+
                 // Auto-enter edit mode if requested (e.g. from New Page action)
                 if (this.props.forceEdit) {
                     this.toggleEdit();
@@ -205,8 +229,6 @@ export class DocContent extends Component {
             this.state.editMarkdown = this.state.doc.content_md || '';
             this.state.mode = 'edit';
             this.state.showCodeView = false;
-            // Refresh parents list when entering edit mode to ensure it's up to date
-            this.loadParents();
         } else {
             // Cancel Edit - Release Lock
             await this.orm.call("doc.page", "action_release_lock", [this.state.doc.id]);
@@ -287,12 +309,9 @@ export class DocContent extends Component {
                 parent_id: this.state.editParentId ? parseInt(this.state.editParentId) : false,
             });
 
-            // Release Lock
+            // Release Lock (the server writes the MD file once the save is committed)
             await this.orm.call("doc.page", "action_release_lock", [this.state.doc.id]);
 
-            // Sync to disk immediately to persist changes to MD files
-            await this.orm.call("doc.page", "action_sync_to_disk", [this.state.doc.id]);
-
             // Reload doc
             await this.loadDoc(this.state.doc.id);
 
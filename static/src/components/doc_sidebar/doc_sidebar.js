@@ -9,12 +9,16 @@ export class DocSidebar extends Component {
         });
     }
 
-    toggleExpand(nodeId, event) {
+    async toggleExpand(node, event) {
         event.stopPropagation();
-        if (this.state.expanded[nodeId]) {
-            delete this.state.expanded[nodeId];
+        if (this.state.expanded[node.id]) {
+            delete this.state.expanded[node.id];
         } else {
-            this.state.expanded[nodeId] = true;
+            // Children below the loaded depth are fetched on first expand
+            if (!node.children_loaded && this.props.onLoadChildren) {
+                await this.props.onLoadChildren(node.id);
+            }
+            this.state.expanded[node.id] = true;
         }
     }
 
@@ -30,4 +34,5 @@ DocSidebar.props = {
     treeData: { type: Array },
     currentDocId: { type: [Number, Boolean, null], optional: true },
     onSelect: { type: Function },
+    onLoadChildren: { type: Function, optional: true },
 };
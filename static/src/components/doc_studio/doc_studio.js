@@ -1,12 +1,18 @@
 /* @odoo-module */
 
-import { Component, useState, onWillStart } from "@odoo/owl";
+import { Component, useState, onWillStart, toRaw, markup } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 import { registry } from "@web/core/registry";
 import { ShareDialog } from "../share_dialog/share_dialog";
 import { DocSidebar } from "../doc_sidebar/doc_sidebar";
 import { DocContent } from "../doc_content/doc_content";
 
+// Levels of the page tree loaded upfront, deeper ones are fetched on expand
+const NAV_TREE_DEPTH = 2;
+
+// Sidebar tree kept across Doc Studio openings, revalidated by structure version
+const treeCache = { version: null, tree: [] };
+
 export class DocStudio extends Component {
     setup() {
         this.orm = useService("orm");
@@ -14,19 +20,17 @@ export class DocStudio extends Component {
         this.actionService = useService("action");
         this.state = useState({
             currentDocId: null,
-            treeData: [],
+            treeData: treeCache.tree,
             searchResults: [],
             searchTerm: "",
             isLoading: true,
         });
 
         onWillStart(async () => {
-            // Auto-sync files from disk on open
-            try {
-                await this.orm.call("doc.page", "sync_all_from_disk", []);
-            } catch (e) {
-                console.warn("Auto-sync failed:", e);
-            }
+            // Files are synced from disk in the background: just ask for a run soon
+            this.orm.call("doc.page", "action_request_disk_sync", []).catch((e) => {
+                console.warn("Auto-sync request failed:", e);
+            });
             await this.loadTree();
         });
     }
@@ -36,7 +40,17 @@ export class DocStudio extends Component {
     async loadTree() {
         this.state.isLoading = true;
         try {
-            this.state.treeData = await this.orm.call("doc.page", "get_nav_tree", []);
+            const result = await this.orm.call("doc.page", "get_nav_tree_state", [], {
+                known_version: treeCache.version,
+                depth: NAV_TREE_DEPTH,
+            });
+            if (result.tree) {
+                this.state.treeData = result.tree;
+            } else if (!result.not_modified) {
+                this.applyTreeDelta(result.nodes, result.removed);
+            }
+            treeCache.version = result.version;
+            treeCache.tree = toRaw(this.state.treeData);
 
             // Check for active_id in action context (deep linking)
             let deepLinkId = null;
@@ -59,6 +73,87 @@ export class DocStudio extends Component {
         }
     }
 
+    findNode(nodes, nodeId) {
+        for (const node of nodes) {
+            if (node.id === nodeId) return node;
+            const found = this.findNode(node.children, nodeId);
+            if (found) return found;
+        }
+        return null;
+    }
+
+    findSiblings(nodeId) {
+        const stack = [this.state.treeData];
+        while (stack.length) {
+            const nodes = stack.pop();
+            if (nodes.some((node) => node.id === nodeId)) return nodes;
+            for (const node of nodes) stack.push(node.children);
+        }
+        return null;
+    }
+
+    applyTreeDelta(changedNodes, removedIds) {
+        // Detach removed and changed nodes, keeping the loaded subtrees of the latter
+        const existing = {};
+        for (const nodeId of [...removedIds, ...changedNodes.map((node) => node.id)]) {
+            const siblings = this.findSiblings(nodeId);
+            if (!siblings) continue;
+            const index = siblings.findIndex((node) => node.id === nodeId);
+            existing[nodeId] = siblings[index];
+            siblings.splice(index, 1);
+        }
+
+        // Re-attach under their (possibly new) parents; parents may come after children
+        let pending = changedNodes;
+        let progress = true;
+        while (pending.length && progress) {
+            progress = false;
+            const next = [];
+            for (const data of pending) {
+                const parent = data.parent_id && this.findNode(this.state.treeData, data.parent_id);
+                if (data.parent_id && !parent) {
+                    next.push(data);
+                    continue;
+                }
+                progress = true;
+                if (parent && !parent.children_loaded) {
+                    parent.has_children = true;
+                    continue;
+                }
+                const previous = existing[data.id];
+                const node = previous
+                    ? Object.assign(previous, {
+                          name: data.name,
+                          file_path: data.file_path,
+                          sequence: data.sequence,
+                          parent_id: data.parent_id,
+                          has_children: data.has_children || previous.children.length > 0,
+                      })
+                    : { ...data, children_loaded: !data.has_children };
+                const siblings = parent ? parent.children : this.state.treeData;
+                siblings.push(node);
+                siblings.sort((a, b) => a.sequence - b.sequence || a.id - b.id);
+                if (parent) parent.has_children = true;
+            }
+            pending = next;
+        }
+        // Still pending: the parent is not in the loaded tree (hidden or not expanded yet)
+    }
+
+    async loadChildren(nodeId) {
+        const node = this.findNode(this.state.treeData, nodeId);
+        if (!node || node.children_loaded) return;
+        try {
+            node.children = await this.orm.call("doc.page", "get_nav_tree", [], {
+                parent_id: nodeId,
+                depth: NAV_TREE_DEPTH,
+            });
+            node.children_loaded = true;
+        } catch (error) {
+            console.error("Error loading doc subtree:", error);
+        }
+    }
+
     async onSearchInput(ev) {
         this.state.searchTerm = ev.target.value;
         if (this.searchTimeout) clearTimeout(this.searchTimeout);
@@ -75,8 +170,13 @@ export class DocStudio extends Component {
         if (!this.state.searchTerm) return;
 
         try {
-            const domain = [['name', 'ilike', this.state.searchTerm]];
-            this.state.searchResults = await this.orm.searchRead("doc.page", domain, ["id", "name", "parent_id"]);
+            const results = await this.orm.call("doc.page", "search_pages", [this.state.searchTerm], { limit: 20 });
+            // Snippets come escaped from the server, with matches in <mark>
+            this.state.searchResults = results.map((result) => ({ ...result, snippet: markup(result.snippet) }));
+            if (!results.length) {
+                // No word matched: fall back to typo-tolerant title matching
+                this.state.searchResults = await this.orm.call("doc.page", "quick_open", [this.state.searchTerm], { limit: 20 });
+            }
         } catch (error) {
             console.error("Error searching docs:", error);
         }